@@ -7,6 +7,8 @@ from openai import OpenAI
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
+from app.utils.ratelimit import OPENAI_LIMITER, SlidingWindow, estimate_tokens
+
 # Load .env file (checks project root, then app directory)
 project_root = Path(__file__).parent.parent.parent
 env_file = project_root / ".env"
@@ -38,7 +40,8 @@ class DigestAgent:
 
 Your summaries should be informative, concise, and help readers quickly understand the main points without reading the full content."""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini",
+                 rate_limiter: Optional[SlidingWindow] = None):
         """
         Initialize the digest agent
         
@@ -46,6 +49,8 @@ Your summaries should be informative, concise, and help readers quickly understa
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
             model: OpenAI model to use (default: gpt-4o-mini)
                    Note: Responses API may require specific model versions
+            rate_limiter: Rate limiter gating API calls (defaults to the
+                          shared OpenAI limiter)
         """
         api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not api_key:
@@ -53,6 +58,7 @@ Your summaries should be informative, concise, and help readers quickly understa
         
         self.client = OpenAI(api_key=api_key)
         self.model = model
+        self.rate_limiter = rate_limiter or OPENAI_LIMITER
     
     def generate_digest(self, content: str, content_type: str = "article") -> DigestOutput:
         """
@@ -71,6 +77,9 @@ Your summaries should be informative, concise, and help readers quickly understa
 
 Provide a concise title and a 2-3 sentence summary that captures the key points."""
         
+        # Throttle to stay under provider RPM/TPM limits
+        self.rate_limiter.acquire(estimate_tokens(self.SYSTEM_PROMPT + user_prompt))
+        
         response = self.client.responses.parse(
             model=self.model,
             input=[
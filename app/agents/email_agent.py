@@ -1,13 +1,17 @@
 """Email agent for generating personalized email digests"""
 
 import os
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from string import Template
 from typing import Optional, List
 from openai import OpenAI
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
+from app.utils.ratelimit import OPENAI_LIMITER, SlidingWindow, estimate_tokens
+
 # Load .env file (checks project root, then app directory)
 project_root = Path(__file__).parent.parent.parent
 env_file = project_root / ".env"
@@ -16,6 +20,214 @@ if not env_file.exists():
 load_dotenv(env_file if env_file.exists() else None)
 
 
+# Email HTML skeleton, built once at import so per-user rendering is a cheap
+# substitution instead of re-assembling the full stylesheet on every call
+_EMAIL_HTML_HEAD = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <style>
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+        .header {
+            border-bottom: 2px solid #4A90E2;
+            padding-bottom: 10px;
+            margin-bottom: 20px;
+        }
+        .greeting {
+            font-size: 24px;
+            font-weight: bold;
+            margin-bottom: 5px;
+        }
+        .date {
+            color: #666;
+            font-size: 14px;
+        }
+        .introduction {
+            background-color: #f5f5f5;
+            padding: 15px;
+            border-radius: 5px;
+            margin: 20px 0;
+            font-size: 15px;
+        }
+        .section {
+            margin: 30px 0;
+            padding: 20px;
+            background-color: #ffffff;
+            border-left: 4px solid #4A90E2;
+            border-radius: 4px;
+            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+        }
+        .section-header {
+            display: flex;
+            align-items: center;
+            margin-bottom: 15px;
+        }
+        .rank-badge {
+            display: inline-block;
+            background-color: #4A90E2;
+            color: white;
+            padding: 5px 12px;
+            border-radius: 20px;
+            font-size: 14px;
+            font-weight: bold;
+            margin-right: 15px;
+            min-width: 45px;
+            text-align: center;
+        }
+        .section-title {
+            font-size: 20px;
+            font-weight: bold;
+            color: #333;
+            margin: 0;
+            flex: 1;
+        }
+        .section-title a {
+            color: #4A90E2;
+            text-decoration: none;
+        }
+        .section-title a:hover {
+            text-decoration: underline;
+        }
+        .section-summary {
+            color: #555;
+            margin: 15px 0;
+            line-height: 1.7;
+            font-size: 15px;
+        }
+        .read-more-button {
+            display: inline-block;
+            background-color: #4A90E2;
+            color: white;
+            padding: 10px 20px;
+            border-radius: 5px;
+            text-decoration: none;
+            font-weight: bold;
+            margin-top: 15px;
+            font-size: 14px;
+        }
+        .read-more-button:hover {
+            background-color: #357ABD;
+        }
+        .youtube-video {
+            margin-top: 15px;
+            text-align: center;
+        }
+        .youtube-thumbnail {
+            display: inline-block;
+            position: relative;
+            max-width: 100%;
+            border-radius: 8px;
+            overflow: hidden;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.2);
+        }
+        .youtube-thumbnail img {
+            width: 100%;
+            max-width: 560px;
+            height: auto;
+            display: block;
+        }
+        .youtube-play-button {
+            position: absolute;
+            top: 50%;
+            left: 50%;
+            transform: translate(-50%, -50%);
+            width: 68px;
+            height: 48px;
+            background-color: rgba(23, 35, 34, 0.9);
+            border-radius: 12px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+        }
+        .youtube-play-button::before {
+            content: '';
+            border-style: solid;
+            border-width: 12px 0 12px 20px;
+            border-color: transparent transparent transparent white;
+            margin-left: 4px;
+        }
+        .youtube-link {
+            text-decoration: none;
+            color: inherit;
+        }
+        .content-type-badge {
+            display: inline-block;
+            background-color: #e8e8e8;
+            color: #666;
+            padding: 2px 8px;
+            border-radius: 3px;
+            font-size: 11px;
+            margin-left: 10px;
+            text-transform: uppercase;
+        }
+        .footer {
+            margin-top: 30px;
+            padding-top: 20px;
+            border-top: 1px solid #e0e0e0;
+            color: #999;
+            font-size: 12px;
+            text-align: center;
+        }
+    </style>
+</head>
+<body>
+"""
+
+_EMAIL_HEADER_TEMPLATE = Template("""    <div class="header">
+        ${greeting_block}
+        <div class="date">Here is your daily news for ${date_line}</div>
+    </div>
+    
+    <div class="introduction">
+        ${introduction}
+    </div>
+    
+    <div class="sections">
+""")
+
+_SECTION_TEMPLATE = Template("""
+        <div class="section">
+            <div class="section-header">
+                <span class="rank-badge">#${rank}</span>
+                <h2 class="section-title">
+                    <a href="${url}" target="_blank">${header}</a>
+                    <span class="content-type-badge">${content_type}</span>
+                </h2>
+            </div>
+            <div class="section-summary">${summary}</div>""")
+
+_YOUTUBE_TEMPLATE = Template("""
+            <div class="youtube-video">
+                <a href="${url}" target="_blank" class="youtube-link">
+                    <div class="youtube-thumbnail">
+                        <img src="${thumbnail_url}" alt="${header}" />
+                        <div class="youtube-play-button"></div>
+                    </div>
+                </a>
+            </div>""")
+
+_READ_MORE_TEMPLATE = Template("""
+            <a href="${url}" target="_blank" class="read-more-button">Read more →</a>""")
+
+_EMAIL_HTML_FOOTER = """
+    </div>
+    
+    <div class="footer">
+        <p>This is your personalized news digest, ranked by relevance to your interests.</p>
+    </div>
+</body>
+</html>
+"""
+
+
 class EmailIntroduction(BaseModel):
     """Structured output for email introduction"""
     introduction: str = Field(..., description="A brief, engaging introduction (2-3 sentences) summarizing what's coming in the top articles")
@@ -56,13 +268,16 @@ class EmailAgent:
 
 Your introductions should give readers a quick overview of what's coming while maintaining their interest."""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini",
+                 rate_limiter: Optional[SlidingWindow] = None):
         """
         Initialize the email agent
         
         Args:
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
             model: OpenAI model to use (default: gpt-4o-mini)
+            rate_limiter: Rate limiter gating API calls (defaults to the
+                          shared OpenAI limiter)
         """
         api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not api_key:
@@ -70,7 +285,35 @@ Your introductions should give readers a quick overview of what's coming while m
         
         self.client = OpenAI(api_key=api_key)
         self.model = model
-    
+        self.rate_limiter = rate_limiter or OPENAI_LIMITER
+        self._smtp_service = None  # Set while inside smtp_session()
+
+    @contextmanager
+    def smtp_session(self):
+        """
+        Context manager holding a single persistent SMTP connection
+
+        All send_email() calls inside the block reuse one authenticated
+        connection instead of paying the TLS+AUTH handshake per email.
+        Useful when sending digests to many users in a loop:
+
+            with email_agent.smtp_session():
+                for user in users:
+                    email_agent.send_email(user.email, content)
+
+        The connection is closed when the block exits, even on error.
+        """
+        from app.services.smtp_service import SMTPService
+
+        smtp_service = SMTPService()
+        smtp_service.connect()
+        self._smtp_service = smtp_service
+        try:
+            yield smtp_service
+        finally:
+            self._smtp_service = None
+            smtp_service.close()
+
     def _format_date(self, date: Optional[datetime] = None) -> str:
         """
         Format date in a readable format (e.g., "Friday, November 28th")
@@ -123,6 +366,9 @@ Articles:
 
 Write an introduction that gives readers a quick overview and makes them excited to read more."""
         
+        # Throttle to stay under provider RPM/TPM limits
+        self.rate_limiter.acquire(estimate_tokens(self.SYSTEM_PROMPT + user_prompt))
+        
         response = self.client.responses.parse(
             model=self.model,
             input=[
@@ -134,16 +380,19 @@ Write an introduction that gives readers a quick overview and makes them excited
         
         return response.output_parsed.introduction
     
-    def generate_email_content(self, user_name: Optional[str], ranked_items: List[dict], 
-                              date: Optional[datetime] = None) -> EmailContent:
+    def generate_email_content(self, user_name: Optional[str], ranked_items: List[dict],
+                              date: Optional[datetime] = None,
+                              introduction: Optional[str] = None) -> EmailContent:
         """
         Generate complete email content structure
-        
+
         Args:
             user_name: User's name for personalization (None or empty to skip greeting)
             ranked_items: List of ranked digest items (will use top 10)
             date: Date for the email (defaults to today)
-            
+            introduction: Pre-written introduction text (skips the LLM
+                call; used when the fused ranking step already wrote one)
+
         Returns:
             EmailContent with greeting, date, introduction, and sections
         """
@@ -162,8 +411,9 @@ Write an introduction that gives readers a quick overview and makes them excited
         # Format date
         date_line = self._format_date(date)
         
-        # Generate introduction
-        introduction = self.generate_introduction(top_items)
+        # Generate introduction unless one was supplied by the caller
+        if introduction is None:
+            introduction = self.generate_introduction(top_items)
         
         # Create article sections with headers
         sections = [
@@ -205,228 +455,56 @@ Write an introduction that gives readers a quick overview and makes them excited
         """
         Format email content as HTML
         
+        The HTML skeleton and per-section templates are module-level
+        constants compiled once at import; this method only substitutes
+        the per-user values.
+        
         Args:
             email_content: EmailContent object
             
         Returns:
             HTML formatted email string
         """
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        .header {{
-            border-bottom: 2px solid #4A90E2;
-            padding-bottom: 10px;
-            margin-bottom: 20px;
-        }}
-        .greeting {{
-            font-size: 24px;
-            font-weight: bold;
-            margin-bottom: 5px;
-        }}
-        .date {{
-            color: #666;
-            font-size: 14px;
-        }}
-        .introduction {{
-            background-color: #f5f5f5;
-            padding: 15px;
-            border-radius: 5px;
-            margin: 20px 0;
-            font-size: 15px;
-        }}
-        .section {{
-            margin: 30px 0;
-            padding: 20px;
-            background-color: #ffffff;
-            border-left: 4px solid #4A90E2;
-            border-radius: 4px;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        }}
-        .section-header {{
-            display: flex;
-            align-items: center;
-            margin-bottom: 15px;
-        }}
-        .rank-badge {{
-            display: inline-block;
-            background-color: #4A90E2;
-            color: white;
-            padding: 5px 12px;
-            border-radius: 20px;
-            font-size: 14px;
-            font-weight: bold;
-            margin-right: 15px;
-            min-width: 45px;
-            text-align: center;
-        }}
-        .section-title {{
-            font-size: 20px;
-            font-weight: bold;
-            color: #333;
-            margin: 0;
-            flex: 1;
-        }}
-        .section-title a {{
-            color: #4A90E2;
-            text-decoration: none;
-        }}
-        .section-title a:hover {{
-            text-decoration: underline;
-        }}
-        .section-summary {{
-            color: #555;
-            margin: 15px 0;
-            line-height: 1.7;
-            font-size: 15px;
-        }}
-        .read-more-button {{
-            display: inline-block;
-            background-color: #4A90E2;
-            color: white;
-            padding: 10px 20px;
-            border-radius: 5px;
-            text-decoration: none;
-            font-weight: bold;
-            margin-top: 15px;
-            font-size: 14px;
-        }}
-        .read-more-button:hover {{
-            background-color: #357ABD;
-        }}
-        .youtube-video {{
-            margin-top: 15px;
-            text-align: center;
-        }}
-        .youtube-thumbnail {{
-            display: inline-block;
-            position: relative;
-            max-width: 100%;
-            border-radius: 8px;
-            overflow: hidden;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.2);
-        }}
-        .youtube-thumbnail img {{
-            width: 100%;
-            max-width: 560px;
-            height: auto;
-            display: block;
-        }}
-        .youtube-play-button {{
-            position: absolute;
-            top: 50%;
-            left: 50%;
-            transform: translate(-50%, -50%);
-            width: 68px;
-            height: 48px;
-            background-color: rgba(23, 35, 34, 0.9);
-            border-radius: 12px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-        }}
-        .youtube-play-button::before {{
-            content: '';
-            border-style: solid;
-            border-width: 12px 0 12px 20px;
-            border-color: transparent transparent transparent white;
-            margin-left: 4px;
-        }}
-        .youtube-link {{
-            text-decoration: none;
-            color: inherit;
-        }}
-        .content-type-badge {{
-            display: inline-block;
-            background-color: #e8e8e8;
-            color: #666;
-            padding: 2px 8px;
-            border-radius: 3px;
-            font-size: 11px;
-            margin-left: 10px;
-            text-transform: uppercase;
-        }}
-        .footer {{
-            margin-top: 30px;
-            padding-top: 20px;
-            border-top: 1px solid #e0e0e0;
-            color: #999;
-            font-size: 12px;
-            text-align: center;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        {f'<div class="greeting">{email_content.greeting}</div>' if email_content.greeting else ''}
-        <div class="date">Here is your daily news for {email_content.date_line}</div>
-    </div>
-    
-    <div class="introduction">
-        {email_content.introduction}
-    </div>
-    
-    <div class="sections">
-"""
+        parts = [_EMAIL_HTML_HEAD]
+        
+        greeting_block = f'<div class="greeting">{email_content.greeting}</div>' if email_content.greeting else ''
+        parts.append(_EMAIL_HEADER_TEMPLATE.substitute(
+            greeting_block=greeting_block,
+            date_line=email_content.date_line,
+            introduction=email_content.introduction
+        ))
         
         for section in email_content.sections:
             # Check if it's a YouTube video
             youtube_video_id = self._extract_youtube_video_id(section.url) if section.content_type == 'video' else None
             
-            html += f"""
-        <div class="section">
-            <div class="section-header">
-                <span class="rank-badge">#{section.rank}</span>
-                <h2 class="section-title">
-                    <a href="{section.url}" target="_blank">{section.header}</a>
-                    <span class="content-type-badge">{section.content_type}</span>
-                </h2>
-            </div>
-            <div class="section-summary">{section.summary}</div>"""
+            parts.append(_SECTION_TEMPLATE.substitute(
+                rank=section.rank,
+                url=section.url,
+                header=section.header,
+                content_type=section.content_type,
+                summary=section.summary
+            ))
             
             # Add YouTube video thumbnail if it's a video
             if youtube_video_id:
                 thumbnail_url = f"https://img.youtube.com/vi/{youtube_video_id}/maxresdefault.jpg"
-                html += f"""
-            <div class="youtube-video">
-                <a href="{section.url}" target="_blank" class="youtube-link">
-                    <div class="youtube-thumbnail">
-                        <img src="{thumbnail_url}" alt="{section.header}" />
-                        <div class="youtube-play-button"></div>
-                    </div>
-                </a>
-            </div>"""
+                parts.append(_YOUTUBE_TEMPLATE.substitute(
+                    url=section.url,
+                    thumbnail_url=thumbnail_url,
+                    header=section.header
+                ))
             else:
                 # Add "Read more" button only for articles (not videos)
-                html += f"""
-            <a href="{section.url}" target="_blank" class="read-more-button">Read more →</a>"""
+                parts.append(_READ_MORE_TEMPLATE.substitute(url=section.url))
             
-            html += """
+            parts.append("""
         </div>
-"""
+""")
         
-        html += """
-    </div>
-    
-    <div class="footer">
-        <p>This is your personalized news digest, ranked by relevance to your interests.</p>
-    </div>
-</body>
-</html>
-"""
+        parts.append(_EMAIL_HTML_FOOTER)
         
-        return html
+        return ''.join(parts)
     
     def format_email_text(self, email_content: EmailContent) -> str:
         """
@@ -484,9 +562,9 @@ Read more: {section.url}
         
         # Create subject line
         subject = f"Your Daily News Digest - {email_content.date_line}"
-        
-        # Send via SMTP
-        smtp_service = SMTPService()
+
+        # Send via SMTP (reuse persistent connection if inside smtp_session())
+        smtp_service = self._smtp_service or SMTPService()
         return smtp_service.send_email(
             to=to,
             subject=subject,
@@ -0,0 +1,65 @@
+"""Lexical pre-filter for digest ranking"""
+
+import math
+import re
+from collections import Counter
+
+# How many digests to keep for the LLM reranking pass
+DEFAULT_TOP_K = 30
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokenize(text: str) -> list:
+    """Lowercase and split text into alphanumeric tokens"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def top_k_by_relevance(digests: list, profile_text: str, k: int = DEFAULT_TOP_K) -> list:
+    """
+    Keep the k digests most lexically similar to the user's profile
+
+    Scores each digest's title + summary against the profile text with
+    TF-IDF cosine similarity, entirely in-process. A cheap first pass
+    like this bounds how many digests the (slow, token-metered) LLM
+    reranking call has to score; the LLM still does the fine ranking.
+
+    Args:
+        digests: Digest dicts with 'title' and 'summary' keys
+        profile_text: User background/interests text to score against
+        k: Number of digests to keep
+
+    Returns:
+        List of up to k digest dicts, most similar first (input order and
+        content unchanged when len(digests) <= k)
+    """
+    if len(digests) <= k:
+        return list(digests)
+
+    docs = [_tokenize(f"{d['title']} {d['summary']}") for d in digests]
+    query = _tokenize(profile_text)
+    if not query:
+        return list(digests)[:k]
+
+    # Document frequencies over the digest corpus
+    df = Counter()
+    for tokens in docs:
+        df.update(set(tokens))
+    n = len(docs)
+
+    def idf(term: str) -> float:
+        return math.log((n + 1) / (df[term] + 1)) + 1.0
+
+    query_weights = {term: count * idf(term) for term, count in Counter(query).items()}
+    query_norm = math.sqrt(sum(w * w for w in query_weights.values())) or 1.0
+
+    scored = []
+    for i, tokens in enumerate(docs):
+        counts = Counter(tokens)
+        weights = {term: count * idf(term) for term, count in counts.items()}
+        dot = sum(w * query_weights[term] for term, w in weights.items() if term in query_weights)
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        scored.append((dot / (norm * query_norm), i))
+
+    scored.sort(key=lambda pair: pair[0], reverse=True)
+    return [digests[i] for _, i in scored[:k]]
@@ -1,7 +1,8 @@
 """Database connection and session management"""
 
 import os
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import NullPool
 from dotenv import load_dotenv
@@ -51,7 +52,43 @@ def get_db_session():
         db.close()
 
 
+@contextmanager
+def session_scope():
+    """
+    Provide a transactional scope around a series of operations
+
+    Yields one session that can be threaded through multiple pipeline
+    steps (one pool checkout instead of one per step); commits on success,
+    rolls back on error, and always closes.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# Idempotent DDL for columns added to the models after a table already
+# exists in a deployed database. create_all never alters existing tables
+# and there is no alembic here, so each addition gets an
+# ADD COLUMN IF NOT EXISTS statement applied on init.
+_SCHEMA_MIGRATIONS = [
+    # Digest.embedding (similarity pre-ranking)
+    "ALTER TABLE digests ADD COLUMN IF NOT EXISTS embedding TEXT",
+    # Digest.created_at index (recency filters in get_recent/iter_recent);
+    # index=True on the model only materializes on freshly created tables
+    "CREATE INDEX IF NOT EXISTS ix_digests_created_at ON digests (created_at)",
+]
+
+
 def init_db():
-    """Initialize database - create all tables"""
+    """Initialize database - create all tables and apply column additions"""
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for statement in _SCHEMA_MIGRATIONS:
+            conn.execute(text(statement))
 
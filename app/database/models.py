@@ -63,6 +63,13 @@ class Article(Base):
         return f"<Article(id={self.id}, title='{self.title[:50]}...', source_id={self.source_id})>"
 
 
+# Placeholder stored in Video.transcript when a transcript is unavailable,
+# so unavailable videos are not re-fetched on every run. Rows holding this
+# value are excluded from the *_without_transcript queries by the
+# transcript IS NULL filter.
+TRANSCRIPT_UNAVAILABLE = "transcript is not available"
+
+
 class Video(Base):
     """Video model for YouTube videos"""
     __tablename__ = "videos"
@@ -115,7 +122,9 @@ class Digest(Base):
     title = Column(String(500), nullable=False, index=True)
     summary = Column(Text, nullable=False)  # 2-3 sentence summary
     content_type = Column(String(50), nullable=False)  # 'article' or 'video'
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    embedding = Column(Text, nullable=True)  # JSON-encoded embedding vector for similarity pre-ranking
+    # Indexed: get_recent/iter_recent filter and order by created_at
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True)
     
     # Relationships
     article = relationship("Article")
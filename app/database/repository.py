@@ -2,8 +2,8 @@
 
 from datetime import datetime, timezone
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import and_, or_, insert, func
 from app.database.models import Source, Article, Video, UserSettings, Digest, DigestSent, SourceType
 from app.database.connection import get_db_session
 
@@ -29,7 +29,63 @@ class SourceRepository:
         db.commit()
         db.refresh(source)
         return source
-    
+
+    @staticmethod
+    def get_or_create(db: Session, name: str, url: str, source_type: SourceType,
+                      youtube_channel_id: Optional[str] = None,
+                      youtube_username: Optional[str] = None,
+                      rss_url: Optional[str] = None) -> tuple:
+        """
+        Get a source by URL, creating it if missing, in one statement
+
+        Uses INSERT ... ON CONFLICT (url) DO NOTHING RETURNING id, so the
+        common create path costs a single round trip instead of a SELECT
+        followed by an INSERT, and there is no race window between the
+        existence check and the insert. A collision on one of the other
+        unique columns (rss_url, youtube_channel_id, youtube_username -
+        e.g. a source whose site url changed in config) falls back to
+        the matching lookup instead of aborting the run.
+
+        Returns:
+            (source, created) tuple; created is True when the row was
+            inserted by this call
+        """
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        from sqlalchemy.exc import IntegrityError
+
+        stmt = pg_insert(Source).values(
+            name=name,
+            url=url,
+            source_type=source_type,
+            youtube_channel_id=youtube_channel_id,
+            youtube_username=youtube_username,
+            rss_url=rss_url
+        ).on_conflict_do_nothing(index_elements=['url']).returning(Source.id)
+
+        try:
+            source_id = db.execute(stmt).scalar()
+            db.commit()
+        except IntegrityError:
+            # ON CONFLICT only covers url; the insert collided on
+            # another unique column, so the source already exists under
+            # a different url - return that row
+            db.rollback()
+            for lookup, value in (
+                (SourceRepository.get_by_rss_url, rss_url),
+                (SourceRepository.get_by_youtube_channel_id, youtube_channel_id),
+                (SourceRepository.get_by_youtube_username, youtube_username),
+            ):
+                if value:
+                    source = lookup(db, value)
+                    if source:
+                        return source, False
+            raise
+
+        if source_id is not None:
+            return SourceRepository.get_by_id(db, source_id), True
+        # Conflict on url: the row already existed, fetch it
+        return SourceRepository.get_by_url(db, url), False
+
     @staticmethod
     def get_by_id(db: Session, source_id: int) -> Optional[Source]:
         """Get source by ID"""
@@ -86,42 +142,6 @@ class SourceRepository:
             db.commit()
             return True
         return False
-    
-    @staticmethod
-    def get_or_create(db: Session, name: str, url: str, source_type: SourceType,
-                     youtube_channel_id: Optional[str] = None,
-                     youtube_username: Optional[str] = None,
-                     rss_url: Optional[str] = None) -> Source:
-        """Get existing source or create a new one"""
-        # Try to find existing source by URL first (most reliable)
-        source = SourceRepository.get_by_url(db, url)
-        if source:
-            return source
-        
-        # For RSS sources, also check RSS URL
-        if source_type == SourceType.RSS and rss_url:
-            source = SourceRepository.get_by_rss_url(db, rss_url)
-            if source:
-                return source
-        
-        # For YouTube sources, check channel ID and username
-        if source_type == SourceType.YOUTUBE:
-            if youtube_channel_id:
-                source = SourceRepository.get_by_youtube_channel_id(db, youtube_channel_id)
-                if source:
-                    return source
-            if youtube_username:
-                source = SourceRepository.get_by_youtube_username(db, youtube_username)
-                if source:
-                    return source
-        
-        # Create new source if not found
-        return SourceRepository.create(
-            db, name, url, source_type,
-            youtube_channel_id=youtube_channel_id,
-            youtube_username=youtube_username,
-            rss_url=rss_url
-        )
 
 
 class ArticleRepository:
@@ -212,6 +232,28 @@ class ArticleRepository:
         """Check if article exists by URL"""
         return db.query(Article).filter(Article.url == url).first() is not None
     
+    @staticmethod
+    def get_candidates(db: Session) -> List[Article]:
+        """
+        Get all articles without their large text columns
+
+        Loads only the columns needed to decide whether an article still
+        needs processing (id, url, title, description, published_at), so
+        candidate scans don't drag every markdown_content blob over the
+        wire. Fetch full rows for survivors with get_by_ids.
+        """
+        return db.query(Article).options(
+            load_only(Article.id, Article.url, Article.title,
+                      Article.description, Article.published_at)
+        ).order_by(Article.published_at.desc()).all()
+
+    @staticmethod
+    def get_by_ids(db: Session, article_ids: List[int]) -> List[Article]:
+        """Get full article rows (including markdown) for a list of IDs"""
+        if not article_ids:
+            return []
+        return db.query(Article).filter(Article.id.in_(article_ids)).all()
+
     @staticmethod
     def get_without_markdown(db: Session, limit: Optional[int] = None) -> List[Article]:
         """Get articles without markdown content"""
@@ -220,6 +262,35 @@ class ArticleRepository:
             query = query.limit(limit)
         return query.all()
     
+    @staticmethod
+    def count_without_markdown(db: Session) -> int:
+        """Count articles without markdown content"""
+        return db.query(Article).filter(Article.markdown_content.is_(None)).count()
+
+    @staticmethod
+    def iter_without_markdown(db: Session, limit: Optional[int] = None, window: int = 200):
+        """
+        Iterate articles without markdown content in id-keyed windows
+
+        The candidate ids are materialized up front (ints only), then the
+        rows come one window at a time through fresh queries. Unlike a
+        streaming server-side cursor, this survives callers committing
+        mid-iteration - the batch scripts flush updates every few dozen
+        rows - while memory stays O(window) for the full rows.
+        """
+        id_query = (db.query(Article.id)
+                    .filter(Article.markdown_content.is_(None))
+                    .order_by(Article.published_at.desc()))
+        if limit:
+            id_query = id_query.limit(limit)
+        ids = [row[0] for row in id_query.all()]
+
+        for start in range(0, len(ids), window):
+            window_ids = ids[start:start + window]
+            yield from (db.query(Article)
+                        .filter(Article.id.in_(window_ids))
+                        .order_by(Article.published_at.desc()))
+
     @staticmethod
     def update_markdown(db: Session, article_id: int, markdown_content: str) -> Optional[Article]:
         """Update article markdown content"""
@@ -298,6 +369,35 @@ class VideoRepository:
             query = query.limit(limit)
         return query.all()
     
+    @staticmethod
+    def count_without_transcript(db: Session) -> int:
+        """Count videos without transcripts"""
+        return db.query(Video).filter(Video.transcript.is_(None)).count()
+
+    @staticmethod
+    def iter_without_transcript(db: Session, limit: Optional[int] = None, window: int = 200):
+        """
+        Iterate videos without transcripts in id-keyed windows
+
+        The candidate ids are materialized up front (ints only), then the
+        rows come one window at a time through fresh queries. Unlike a
+        streaming server-side cursor, this survives callers committing
+        mid-iteration - the batch scripts flush updates every few dozen
+        rows - while memory stays O(window) for the full rows.
+        """
+        id_query = (db.query(Video.id)
+                    .filter(Video.transcript.is_(None))
+                    .order_by(Video.published_at.desc()))
+        if limit:
+            id_query = id_query.limit(limit)
+        ids = [row[0] for row in id_query.all()]
+
+        for start in range(0, len(ids), window):
+            window_ids = ids[start:start + window]
+            yield from (db.query(Video)
+                        .filter(Video.id.in_(window_ids))
+                        .order_by(Video.published_at.desc()))
+
     @staticmethod
     def get_all(db: Session, limit: Optional[int] = None) -> List[Video]:
         """Get all videos"""
@@ -338,6 +438,26 @@ class VideoRepository:
             return True
         return False
     
+    @staticmethod
+    def get_candidates(db: Session) -> List[Video]:
+        """
+        Get all videos without their transcript column
+
+        Same idea as ArticleRepository.get_candidates: the candidate scan
+        only needs identifying columns, not the transcript text.
+        """
+        return db.query(Video).options(
+            load_only(Video.id, Video.url, Video.title,
+                      Video.description, Video.published_at)
+        ).order_by(Video.published_at.desc()).all()
+
+    @staticmethod
+    def get_by_ids(db: Session, video_ids: List[int]) -> List[Video]:
+        """Get full video rows (including transcript) for a list of IDs"""
+        if not video_ids:
+            return []
+        return db.query(Video).filter(Video.id.in_(video_ids)).all()
+
     @staticmethod
     def exists_by_video_id(db: Session, video_id: str) -> bool:
         """Check if video exists by YouTube video ID"""
@@ -373,6 +493,13 @@ class UserSettingsRepository:
     def get_by_email(db: Session, email: str) -> Optional[UserSettings]:
         """Get user settings by email"""
         return db.query(UserSettings).filter(UserSettings.email == email).first()
+
+    @staticmethod
+    def get_by_emails(db: Session, emails: List[str]) -> List[UserSettings]:
+        """Get user settings for multiple emails in a single query"""
+        if not emails:
+            return []
+        return db.query(UserSettings).filter(UserSettings.email.in_(emails)).all()
     
     @staticmethod
     def get_all(db: Session) -> List[UserSettings]:
@@ -436,6 +563,30 @@ class DigestRepository:
         db.refresh(digest)
         return digest
     
+    @staticmethod
+    def bulk_create(db: Session, rows: List[dict]) -> int:
+        """
+        Insert multiple digests in a single statement
+
+        Rows are plain dicts matching Digest columns (url, title, summary,
+        content_type, optional article_id/video_id/created_at). Callers are
+        expected to have filtered out URLs that already exist. One
+        executemany INSERT + one commit instead of a round-trip per digest.
+
+        Returns:
+            Number of rows inserted
+        """
+        if not rows:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        for row in rows:
+            row.setdefault('created_at', now)
+
+        db.execute(insert(Digest), rows)
+        db.commit()
+        return len(rows)
+
     @staticmethod
     def get_by_id(db: Session, digest_id: int) -> Optional[Digest]:
         """Get digest by ID"""
@@ -475,11 +626,81 @@ class DigestRepository:
             query = query.limit(limit)
         return query.all()
     
+    @staticmethod
+    def iter_recent(db: Session, hours: int = 24, limit: Optional[int] = None, yield_per: int = 1000):
+        """
+        Stream recent digests within specified hours
+
+        Unlike get_recent, rows come through a server-side cursor in
+        chunks of yield_per and only the columns needed for ranking are
+        loaded (no embedding blob), so memory stays O(batch) for large
+        digest windows.
+        """
+        from datetime import timedelta
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+
+        query = db.query(Digest).options(
+            load_only(Digest.id, Digest.url, Digest.title,
+                      Digest.summary, Digest.content_type)
+        ).filter(Digest.created_at >= cutoff).order_by(Digest.created_at.desc())
+        if limit:
+            query = query.limit(limit)
+        return query.execution_options(stream_results=True).yield_per(yield_per)
+
     @staticmethod
     def exists_by_url(db: Session, url: str) -> bool:
         """Check if digest exists by URL"""
         return db.query(Digest).filter(Digest.url == url).first() is not None
     
+    @staticmethod
+    def get_pending_items(db: Session, limit: Optional[int] = None,
+                          sample: Optional[int] = None) -> tuple:
+        """
+        Get articles and videos that don't have a digest yet
+
+        Anti-joins each table against digests on URL, so the database
+        returns only the rows that still need processing — one query per
+        table instead of a full fetch plus per-URL existence checks.
+
+        Args:
+            db: Database session
+            limit: Maximum rows per table (None for all)
+            sample: Return a random sample of this many rows per table
+                instead of the newest ones (for fast dev-loop runs)
+
+        Returns:
+            Tuple of (articles, videos) lists
+        """
+        article_query = db.query(Article).outerjoin(
+            Digest, Digest.url == Article.url
+        ).filter(Digest.url.is_(None))
+        video_query = db.query(Video).outerjoin(
+            Digest, Digest.url == Video.url
+        ).filter(Digest.url.is_(None))
+
+        if sample:
+            # Random sampling happens in the database, so the full pending
+            # set is never transferred
+            article_query = article_query.order_by(func.random()).limit(sample)
+            video_query = video_query.order_by(func.random()).limit(sample)
+        else:
+            article_query = article_query.order_by(Article.published_at.desc())
+            video_query = video_query.order_by(Video.published_at.desc())
+            if limit:
+                article_query = article_query.limit(limit)
+                video_query = video_query.limit(limit)
+
+        return article_query.all(), video_query.all()
+
+    @staticmethod
+    def get_existing_urls(db: Session, urls: List[str]) -> set:
+        """Get the subset of urls that already have a digest (one query)"""
+        if not urls:
+            return set()
+        return {
+            row[0] for row in db.query(Digest.url).filter(Digest.url.in_(urls)).all()
+        }
+    
     @staticmethod
     def delete(db: Session, digest_id: int) -> bool:
         """Delete digest"""
@@ -490,6 +711,15 @@ class DigestRepository:
             return True
         return False
     
+    @staticmethod
+    def get_sent_digest_ids(db: Session, user_email: str) -> set:
+        """Get the set of digest IDs already sent to a user"""
+        return {
+            row[0] for row in db.query(DigestSent.digest_id).filter(
+                DigestSent.user_email == user_email
+            ).all()
+        }
+
     @staticmethod
     def get_recent_not_sent_to_user(db: Session, user_email: str, hours: int = 24, limit: Optional[int] = None) -> List[Digest]:
         """Get recent digests that haven't been sent to a specific user"""
@@ -517,6 +747,17 @@ class DigestRepository:
             query = query.limit(limit)
         return query.all()
     
+    @staticmethod
+    def update_embedding(db: Session, digest_id: int, embedding: List[float]) -> Optional[Digest]:
+        """Store a digest's embedding vector (JSON-encoded)"""
+        import json
+        digest = DigestRepository.get_by_id(db, digest_id)
+        if digest:
+            digest.embedding = json.dumps(embedding)
+            db.commit()
+            db.refresh(digest)
+        return digest
+
     @staticmethod
     def mark_as_sent(db: Session, digest_id: int, user_email: str) -> Optional[DigestSent]:
         """Mark a digest as sent to a user (idempotent - won't create duplicates)"""
@@ -1,6 +1,7 @@
 """User profile management"""
 
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional
 from app.database.connection import get_db_session
 from app.database.repository import UserSettingsRepository
 
@@ -9,10 +10,33 @@ class UserProfile:
     """User profile manager"""
     
     @staticmethod
+    def to_dict(user) -> dict:
+        """
+        Convert a UserSettings row to a profile dictionary
+        
+        Useful when the row is already loaded (e.g. from
+        UserSettingsRepository.get_all) and re-querying by email would be
+        a wasted round-trip.
+        """
+        return {
+            "id": user.id,
+            "email": user.email,
+            "name": user.name or "",
+            "background": user.background or "",
+            "interests": user.interests or "",
+            "system_prompt": user.system_prompt
+        }
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
     def get_profile(email: str) -> Optional[dict]:
         """
         Get user profile by email
         
+        Results are cached (LRU) so repeated lookups across pipeline steps
+        don't each pay a database round-trip. The cache is cleared whenever
+        create_or_update() writes a profile.
+        
         Args:
             email: User's email address
             
@@ -26,14 +50,32 @@ class UserProfile:
             if not user:
                 return None
             
-            return {
-                "id": user.id,
-                "email": user.email,
-                "name": user.name or "",
-                "background": user.background or "",
-                "interests": user.interests or "",
-                "system_prompt": user.system_prompt
-            }
+            return UserProfile.to_dict(user)
+        finally:
+            db.close()
+    
+    @staticmethod
+    def get_profiles(emails: List[str]) -> dict:
+        """
+        Get profiles for multiple users in a single query
+        
+        Prefer this over calling get_profile() in a loop: one round-trip
+        fetches all profiles, and lookups during processing are O(1).
+        
+        Args:
+            emails: List of user email addresses
+            
+        Returns:
+            Dictionary mapping email -> profile dict (missing users omitted)
+        """
+        if not emails:
+            return {}
+        
+        db_gen = get_db_session()
+        db = next(db_gen)
+        try:
+            users = UserSettingsRepository.get_by_emails(db, list(emails))
+            return {user.email: UserProfile.to_dict(user) for user in users}
         finally:
             db.close()
     
@@ -85,14 +127,10 @@ class UserProfile:
                     system_prompt=system_prompt
                 )
             
-            return {
-                "id": user.id,
-                "email": user.email,
-                "name": user.name or "",
-                "background": user.background or "",
-                "interests": user.interests or "",
-                "system_prompt": user.system_prompt
-            }
+            # Invalidate cached lookups so subsequent reads see the update
+            UserProfile.get_profile.cache_clear()
+            
+            return UserProfile.to_dict(user)
         finally:
             db.close()
 
@@ -25,7 +25,8 @@ class NewsAggregator:
         for source_name, rss_url in RSS_FEEDS.items():
             self.openai_scrapers[source_name] = OpenAINewsScraper(rss_url)
     
-    def run(self, hours: int = 24, fetch_transcripts: bool = False, save_to_db: bool = True) -> Dict:
+    def run(self, hours: int = 24, fetch_transcripts: bool = False, save_to_db: bool = True,
+            db=None) -> Dict:
         """
         Run the aggregator and collect all content
         
@@ -33,6 +34,8 @@ class NewsAggregator:
             hours: Number of hours to look back (default: 24)
             fetch_transcripts: Whether to fetch transcripts immediately (default: False)
             save_to_db: Whether to save results to database (default: True)
+            db: Optional existing database session to reuse (caller keeps
+                ownership; a session is opened and closed here if omitted)
             
         Returns:
             Dictionary containing articles and videos from all sources
@@ -45,11 +48,12 @@ class NewsAggregator:
             "summary": {}
         }
         
-        # Get database session if saving to DB
-        db = None
-        if save_to_db:
+        # Use the caller's session if given, otherwise open one for this run
+        owns_session = False
+        if save_to_db and db is None:
             db_gen = get_db_session()
             db = next(db_gen)
+            owns_session = True
         
         try:
             # Get Anthropic articles
@@ -125,7 +129,7 @@ class NewsAggregator:
             return results
             
         finally:
-            if db:
+            if db and owns_session:
                 db.close()
     
     def _save_articles(self, db, articles: List, source_name: str, source_url: str, 
@@ -145,7 +149,7 @@ class NewsAggregator:
             Number of articles saved
         """
         # Get or create source
-        source = SourceRepository.get_or_create(
+        source, _ = SourceRepository.get_or_create(
             db,
             name=source_name,
             url=source_url,
@@ -236,7 +240,7 @@ class NewsAggregator:
             
             # Get or create source for this channel
             channel_url = f"https://www.youtube.com/@{channel_config['username']}"
-            source = SourceRepository.get_or_create(
+            source, _ = SourceRepository.get_or_create(
                 db,
                 name=channel_config['name'],
                 url=channel_url,
@@ -291,7 +295,8 @@ class NewsAggregator:
         return fetcher.fetch_transcripts_for_videos_without(videos)
 
 
-def run_aggregator(hours: int = 24, fetch_transcripts: bool = False, save_to_db: bool = True) -> Dict:
+def run_aggregator(hours: int = 24, fetch_transcripts: bool = False, save_to_db: bool = True,
+                   db=None) -> Dict:
     """
     Convenience function to run the aggregator
     
@@ -299,12 +304,13 @@ def run_aggregator(hours: int = 24, fetch_transcripts: bool = False, save_to_db:
         hours: Number of hours to look back (default: 24)
         fetch_transcripts: Whether to fetch transcripts immediately (default: False)
         save_to_db: Whether to save results to database (default: True)
+        db: Optional existing database session to reuse
         
     Returns:
         Dictionary with aggregated results
     """
     aggregator = NewsAggregator()
-    return aggregator.run(hours=hours, fetch_transcripts=fetch_transcripts, save_to_db=save_to_db)
+    return aggregator.run(hours=hours, fetch_transcripts=fetch_transcripts, save_to_db=save_to_db, db=db)
 
 
 if __name__ == "__main__":
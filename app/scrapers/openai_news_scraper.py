@@ -1,11 +1,116 @@
 """OpenAI news scraper using RSS feeds"""
 
+import email.utils
+import sqlite3
+import time
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Optional
 import feedparser
 from pydantic import BaseModel, Field
 from docling.document_converter import DocumentConverter
 
+# Default on-disk markdown cache location (project root)
+_project_root = Path(__file__).parent.parent.parent
+DEFAULT_MARKDOWN_CACHE_PATH = _project_root / ".markdown_cache.sqlite3"
+# Published articles are effectively immutable; a day of reuse covers
+# repeated conversions across runs without staleness concerns
+MARKDOWN_CACHE_TTL = 24 * 60 * 60
+
+
+class MarkdownCache:
+    """
+    On-disk cache of URL -> markdown conversions
+
+    Converting a page re-downloads it and walks the full document tree,
+    so repeat conversions of the same URL (across runs, and across the
+    class and convenience entry points) are served from SQLite instead.
+    docling performs the HTTP fetch internally, so entries expire on a
+    TTL rather than an ETag revalidation.
+    """
+
+    def __init__(self, path: Optional[Path] = None, ttl: int = MARKDOWN_CACHE_TTL):
+        # check_same_thread off: the test scripts convert URLs from a
+        # thread pool, and these single-statement reads/writes are safe
+        # under SQLite's own serialization
+        self._conn = sqlite3.connect(
+            str(path or DEFAULT_MARKDOWN_CACHE_PATH), check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS markdown ("
+            "url TEXT PRIMARY KEY, fetched_at REAL NOT NULL, content TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._ttl = ttl
+
+    def get(self, url: str) -> Optional[str]:
+        """Get cached markdown for a URL, or None on a miss/expiry"""
+        row = self._conn.execute(
+            "SELECT fetched_at, content FROM markdown WHERE url = ?", (url,)
+        ).fetchone()
+        if not row or time.time() - row[0] > self._ttl:
+            return None
+        return row[1]
+
+    def put(self, url: str, content: str) -> None:
+        """Store markdown for a URL, replacing any stale entry"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO markdown (url, fetched_at, content) VALUES (?, ?, ?)",
+            (url, time.time(), content)
+        )
+        self._conn.commit()
+
+
+_markdown_cache: Optional[MarkdownCache] = None
+
+
+def _get_markdown_cache() -> MarkdownCache:
+    """Lazily open the shared markdown cache"""
+    global _markdown_cache
+    if _markdown_cache is None:
+        _markdown_cache = MarkdownCache()
+    return _markdown_cache
+
+
+@lru_cache(maxsize=4096)
+def _parse_published_string(value: str) -> Optional[datetime]:
+    """
+    Parse an RSS published date string, fast-pathing the common formats
+
+    A feed emits one stable shape for every entry - usually an ISO-8601
+    instant ("2024-01-15T10:30:00Z") or RFC822 ("Mon, 15 Jan 2024
+    10:30:00 GMT") - so both are tried with cheap stdlib parsers before
+    falling back to dateutil's format-guessing, which is an order of
+    magnitude slower per call.
+
+    Memoized on the raw string: repeated get_articles calls over the
+    same feed (different hour windows) re-see identical published
+    strings, and the returned datetimes are immutable so sharing one
+    object per string is safe.
+    """
+    # ISO instant: fixed length with a trailing Z
+    if len(value) == 20 and value[-1] == 'Z':
+        try:
+            return datetime.fromisoformat(value[:-1]).replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+
+    # RFC822: starts with an abbreviated weekday and a comma
+    if ', ' in value[:6]:
+        try:
+            parsed = email.utils.parsedate_to_datetime(value)
+            return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+        except (TypeError, ValueError):
+            pass
+
+    try:
+        from dateutil import parser
+        parsed = parser.parse(value)
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    except Exception:
+        return None
+
 
 class NewsArticle(BaseModel):
     """Model for RSS news article"""
@@ -26,11 +131,38 @@ class OpenAINewsScraper:
         self.rss_url = rss_url
         self.source_name = "OpenAI"
         self.converter = DocumentConverter()
-    
-    def get_articles(self, hours: int = 24) -> List[NewsArticle]:
-        """Get articles published within the specified time frame"""
-        feed = feedparser.parse(self.rss_url)
-        
+        self._feed_cache = {}  # url -> (etag, modified, parsed feed)
+
+    def _fetch_feed(self):
+        """
+        Fetch and parse the RSS feed with ETag/Last-Modified revalidation
+
+        Probing several hour windows re-downloaded and re-parsed the feed
+        once per get_articles call. feedparser supports conditional GETs,
+        so a 304 response reuses the previously parsed feed and repeat
+        calls cost one round trip with no XML parsing.
+        """
+        etag, modified, cached = self._feed_cache.get(self.rss_url, (None, None, None))
+        feed = feedparser.parse(self.rss_url, etag=etag, modified=modified)
+        if cached is not None and getattr(feed, 'status', None) == 304:
+            return cached
+        self._feed_cache[self.rss_url] = (
+            getattr(feed, 'etag', None), getattr(feed, 'modified', None), feed
+        )
+        return feed
+
+    def get_articles(self, hours: int = 24, parsed_feed=None) -> List[NewsArticle]:
+        """
+        Get articles published within the specified time frame
+
+        Args:
+            hours: Number of hours to look back (default: 24)
+            parsed_feed: Already-parsed feedparser result to filter
+                instead of fetching the feed again (callers that parse
+                the feed themselves avoid a duplicate download+parse)
+        """
+        feed = parsed_feed if parsed_feed is not None else self._fetch_feed()
+
         cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
         print(f"    Cutoff time: {cutoff}")
         print(f"    Feed entries found: {len(feed.entries) if feed.entries else 0}")
@@ -45,7 +177,12 @@ class OpenAINewsScraper:
         for entry in feed.entries:
             published_at = self._parse_date(entry)
             if published_at and published_at >= cutoff:
-                articles.append(NewsArticle(
+                # Every field is coerced to its declared type right here
+                # (str accessors, datetime from _parse_date), so
+                # model_construct skips a redundant validation pass per
+                # entry. Validation still applies where articles are
+                # built from untrusted payloads.
+                articles.append(NewsArticle.model_construct(
                     title=entry.get('title', '').strip(),
                     url=entry.get('link', ''),
                     description=self._get_description(entry),
@@ -60,12 +197,7 @@ class OpenAINewsScraper:
         if hasattr(entry, 'published_parsed') and entry.published_parsed:
             return datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
         if hasattr(entry, 'published'):
-            try:
-                from dateutil import parser
-                parsed = parser.parse(entry.published)
-                return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
-            except:
-                pass
+            return _parse_published_string(entry.published)
         return None
     
     def _get_description(self, entry) -> str:
@@ -83,15 +215,42 @@ class OpenAINewsScraper:
         Returns:
             Markdown content as string, or None if conversion fails
         """
+        cached = _get_markdown_cache().get(url)
+        if cached is not None:
+            return cached
+
         try:
             result = self.converter.convert(url)
             document = result.document
             markdown_output = document.export_to_markdown()
+            _get_markdown_cache().put(url, markdown_output)
             return markdown_output
         except Exception as e:
             print(f"Error converting {url} to markdown: {e}")
             return None
 
+    def get_contents_as_markdown(self, urls: List[str],
+                                 max_workers: int = 8) -> List[Optional[str]]:
+        """
+        Convert several URLs to markdown concurrently
+
+        Each conversion is dominated by the page fetch, so the calls run
+        in a thread pool and overlap their network latency. Results come
+        back in input order; failed conversions are None, as in the
+        single-URL method.
+
+        Args:
+            urls: URLs to fetch and convert
+            max_workers: Number of concurrent conversions
+
+        Returns:
+            List of markdown strings (or None per failure), one per URL
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            return list(executor.map(self.get_content_as_markdown, urls))
+
 
 def get_openai_articles(rss_url: str, hours: int = 24) -> List[NewsArticle]:
     """Get articles from RSS feed within time frame"""
@@ -99,13 +258,32 @@ def get_openai_articles(rss_url: str, hours: int = 24) -> List[NewsArticle]:
     return scraper.get_articles(hours)
 
 
+# Shared converter for the module-level convenience function. Building a
+# DocumentConverter initializes the full docling pipeline, so repeated
+# calls reuse one instance (and its HTTP connections) instead of paying
+# that setup per URL - mirroring how the scraper keeps self.converter.
+_shared_converter: Optional[DocumentConverter] = None
+
+
+def _get_shared_converter() -> DocumentConverter:
+    global _shared_converter
+    if _shared_converter is None:
+        _shared_converter = DocumentConverter()
+    return _shared_converter
+
+
 def get_url_content_as_markdown(url: str) -> Optional[str]:
     """Get content from URL and convert to markdown"""
-    converter = DocumentConverter()
+    cached = _get_markdown_cache().get(url)
+    if cached is not None:
+        return cached
+
+    converter = _get_shared_converter()
     try:
         result = converter.convert(url)
         document = result.document
         markdown_output = document.export_to_markdown()
+        _get_markdown_cache().put(url, markdown_output)
         return markdown_output
     except Exception as e:
         print(f"Error converting {url} to markdown: {e}")
@@ -0,0 +1,182 @@
+"""Service for computing text embeddings via OpenAI"""
+
+import hashlib
+import json
+import math
+import os
+import sqlite3
+from pathlib import Path
+from typing import List, Optional
+from openai import OpenAI
+from dotenv import load_dotenv
+
+# Load .env file
+project_root = Path(__file__).parent.parent.parent
+env_file = project_root / ".env"
+if not env_file.exists():
+    env_file = Path(__file__).parent.parent / ".env"
+load_dotenv(env_file if env_file.exists() else None)
+
+# Default on-disk embedding cache location (project root)
+DEFAULT_CACHE_PATH = project_root / ".embed_cache.sqlite3"
+
+
+def _quantize(vector: List[float]) -> tuple:
+    """
+    Quantize a float vector to int8 with a per-vector scale
+
+    Cached embeddings only feed cosine similarity, which tolerates 8-bit
+    precision; storing small ints instead of full-precision floats cuts
+    the serialized cache size roughly 4x.
+
+    Returns:
+        Tuple of (int8 values list, scale)
+    """
+    peak = max((abs(x) for x in vector), default=0.0)
+    if peak == 0.0:
+        return [0] * len(vector), 1.0
+    scale = peak / 127.0
+    return [round(x / scale) for x in vector], scale
+
+
+def _dequantize(quantized: List[int], scale: float) -> List[float]:
+    """Reconstruct the float vector from int8 values and scale"""
+    return [q * scale for q in quantized]
+
+
+class EmbeddingCache:
+    """
+    Content-hashed on-disk cache of embedding vectors
+
+    Keyed by a hash of (model, text), so identical text is embedded once
+    per model across runs and fanouts. SQLite keeps the cache a single
+    self-contained file with no extra dependency. Vectors are stored
+    int8-quantized with a per-vector scale and dequantized on read.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self._conn = sqlite3.connect(str(path or DEFAULT_CACHE_PATH))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def key_for(model: str, text: str) -> str:
+        """Cache key for one (model, text) pair"""
+        return hashlib.blake2b(f"{model}\x00{text}".encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """Get a cached vector (dequantized), or None on a miss"""
+        row = self._conn.execute(
+            "SELECT vector FROM embeddings WHERE key = ?", (key,)
+        ).fetchone()
+        if not row:
+            return None
+        stored = json.loads(row[0])
+        if isinstance(stored, list):
+            # Entry written before quantization was introduced
+            return stored
+        return _dequantize(stored["q"], stored["scale"])
+
+    def put_many(self, items: List[tuple]) -> None:
+        """Store (key, vector) pairs in one transaction, int8-quantized"""
+        if not items:
+            return
+        rows = []
+        for key, vector in items:
+            quantized, scale = _quantize(vector)
+            rows.append((key, json.dumps({"q": quantized, "scale": scale})))
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+        )
+        self._conn.commit()
+
+
+class EmbeddingService:
+    """
+    Service for embedding digest and profile text with OpenAI.
+
+    Used to cheaply pre-rank digests by cosine similarity against a user
+    profile before the (expensive) LLM reranking step.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, model: str = "text-embedding-3-small",
+                 cache: Optional[EmbeddingCache] = None):
+        """
+        Initialize the embedding service
+
+        Args:
+            api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
+            model: Embedding model to use (default: text-embedding-3-small)
+            cache: On-disk embedding cache (one at the default path is
+                opened if omitted)
+        """
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable.")
+
+        self.client = OpenAI(api_key=api_key)
+        self.model = model
+        self.cache = cache if cache is not None else EmbeddingCache()
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed multiple texts in a single API call
+
+        Texts already in the on-disk cache are served from it; only the
+        misses go to the API (and are cached for next time).
+
+        Args:
+            texts: List of texts to embed
+
+        Returns:
+            List of embedding vectors, one per input text
+        """
+        if not texts:
+            return []
+
+        keys = [EmbeddingCache.key_for(self.model, text) for text in texts]
+        vectors = [self.cache.get(key) for key in keys]
+
+        misses = [i for i, vector in enumerate(vectors) if vector is None]
+        if misses:
+            response = self.client.embeddings.create(
+                model=self.model, input=[texts[i] for i in misses]
+            )
+            for i, item in zip(misses, response.data):
+                vectors[i] = item.embedding
+            self.cache.put_many([(keys[i], vectors[i]) for i in misses])
+
+        return vectors
+
+    def embed_text(self, text: str) -> List[float]:
+        """
+        Embed a single text
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        return self.embed_texts([text])[0]
+
+
+def cosine_similarity(a: List[float], b: List[float]) -> float:
+    """
+    Cosine similarity between two vectors
+
+    Args:
+        a: First vector
+        b: Second vector
+
+    Returns:
+        Similarity in [-1.0, 1.0], or 0.0 if either vector is zero
+    """
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = math.sqrt(sum(x * x for x in a))
+    norm_b = math.sqrt(sum(x * x for x in b))
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
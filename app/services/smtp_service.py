@@ -48,6 +48,9 @@ class SMTPService:
         self.smtp_username = smtp_username or os.getenv("SMTP_USERNAME")
         self.smtp_password = smtp_password or os.getenv("SMTP_PASSWORD")
         self.from_email = from_email or os.getenv("FROM_EMAIL") or self.smtp_username
+
+        # Persistent SMTP connection (opened via connect(), reused by send_email)
+        self._connection: Optional[smtplib.SMTP] = None
         
         if not self.smtp_username or not self.smtp_password:
             raise ValueError(
@@ -55,6 +58,47 @@ class SMTPService:
                 "environment variables or pass them to the constructor."
             )
     
+    def connect(self) -> None:
+        """
+        Open a persistent SMTP connection (TLS + login)
+
+        The connection is reused by subsequent send_email() calls, avoiding
+        a full TLS handshake and authentication per email. Call close()
+        when done (or use EmailAgent.smtp_session()).
+        """
+        self.close()
+        server = smtplib.SMTP(self.smtp_host, self.smtp_port)
+        server.starttls()  # Enable encryption
+        server.login(self.smtp_username, self.smtp_password)
+        self._connection = server
+
+    def _ensure_connected(self) -> None:
+        """
+        Make sure the persistent connection is open and alive
+
+        Opens a connection on first use, and probes an existing one with
+        NOOP so a server-side idle disconnect triggers a reconnect here
+        rather than a failure mid-send.
+        """
+        if self._connection is None:
+            self.connect()
+            return
+        try:
+            status, _ = self._connection.noop()
+        except (smtplib.SMTPException, OSError):
+            status = -1
+        if status != 250:
+            self.connect()
+
+    def close(self) -> None:
+        """Close the persistent SMTP connection if open"""
+        if self._connection is not None:
+            try:
+                self._connection.quit()
+            except (smtplib.SMTPException, OSError):
+                pass  # Connection already gone; nothing to clean up
+            self._connection = None
+
     def create_message(self, to: str, subject: str, body_text: str,
                       body_html: Optional[str] = None) -> MIMEMultipart:
         """
@@ -106,19 +150,20 @@ class SMTPService:
         try:
             # Create message
             msg = self.create_message(to, subject, body_text, body_html)
-            
-            # Connect to SMTP server
-            server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-            server.starttls()  # Enable encryption
-            server.login(self.smtp_username, self.smtp_password)
-            
-            # Send email
-            text = msg.as_string()
-            server.sendmail(self.from_email, to, text)
-            server.quit()
-            
+
+            # Every send goes through the persistent connection: one TLS
+            # handshake and login per service lifetime, not per email
+            self._ensure_connected()
+            try:
+                self._connection.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Server dropped the connection between the NOOP and the
+                # send; reconnect and retry once instead of failing
+                self.connect()
+                self._connection.send_message(msg)
+
             return True
-            
+
         except smtplib.SMTPException as e:
             raise Exception(f"Failed to send email: {e}")
         except Exception as e:
@@ -173,5 +218,8 @@ def send_email_via_smtp(to: str, subject: str, body_text: str,
         True if email sent successfully
     """
     service = SMTPService()
-    return service.send_email(to, subject, body_text, body_html)
+    try:
+        return service.send_email(to, subject, body_text, body_html)
+    finally:
+        service.close()
 
@@ -1,6 +1,11 @@
 """Unified YouTube service for scraping channels and fetching transcripts"""
 
+import json
+import sqlite3
+import time
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Dict, Optional
 import os
 import re
@@ -43,6 +48,78 @@ class Transcript(BaseModel):
     text: str = Field(..., description="Transcript text content")
 
 
+# Default on-disk transcript cache location (project root)
+_project_root = Path(__file__).parent.parent.parent
+DEFAULT_TRANSCRIPT_CACHE_PATH = _project_root / ".transcript_cache.sqlite3"
+# Transcripts rarely change once a video is published; a day of reuse
+# saves the network round-trip on every re-run over the same videos
+TRANSCRIPT_CACHE_TTL = 24 * 60 * 60
+
+
+class TranscriptCache:
+    """
+    On-disk cache of video ID -> raw transcript segments
+
+    Each transcript fetch is a full network round-trip to YouTube, and
+    the scripts repeatedly ask for the same videos across runs (and even
+    within one run via the different entry points). Successful fetches
+    land in SQLite as raw segment lists; both the plain-text and the
+    timestamped views are derived from the same cached segments.
+    Unavailable transcripts are not cached so transient failures retry.
+    """
+
+    def __init__(self, path: Optional[Path] = None, ttl: int = TRANSCRIPT_CACHE_TTL):
+        # check_same_thread off: batch scripts fetch transcripts from a
+        # thread pool, and these single-statement reads/writes are safe
+        # under SQLite's own serialization
+        self._conn = sqlite3.connect(
+            str(path or DEFAULT_TRANSCRIPT_CACHE_PATH), check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS transcripts ("
+            "key TEXT PRIMARY KEY, fetched_at REAL NOT NULL, segments TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._ttl = ttl
+
+    def get(self, key: str) -> Optional[list]:
+        """Get cached transcript segments, or None on a miss/expiry"""
+        row = self._conn.execute(
+            "SELECT fetched_at, segments FROM transcripts WHERE key = ?", (key,)
+        ).fetchone()
+        if not row or time.time() - row[0] > self._ttl:
+            return None
+        return json.loads(row[1])
+
+    def put(self, key: str, segments: list) -> None:
+        """Store transcript segments, replacing any stale entry"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO transcripts (key, fetched_at, segments) VALUES (?, ?, ?)",
+            (key, time.time(), json.dumps(segments))
+        )
+        self._conn.commit()
+
+
+_transcript_cache: Optional[TranscriptCache] = None
+
+
+def _get_transcript_cache() -> TranscriptCache:
+    """Lazily open the shared transcript cache"""
+    global _transcript_cache
+    if _transcript_cache is None:
+        _transcript_cache = TranscriptCache()
+    return _transcript_cache
+
+
+# Channel-ID extraction patterns, compiled once at import instead of per
+# resolve call
+_CHANNEL_ID_PATTERNS = [
+    re.compile(r'"channelId":"(UC[a-zA-Z0-9_-]{22})"'),
+    re.compile(r'"externalId":"(UC[a-zA-Z0-9_-]{22})"'),
+    re.compile(r'/channel/(UC[a-zA-Z0-9_-]{22})')
+]
+
+
 class YouTubeService:
     """
     Unified service for YouTube channel scraping and transcript fetching.
@@ -150,88 +227,126 @@ class YouTubeService:
             traceback.print_exc()
             return []
     
-    def get_multiple_channels(self, channel_list: List[Dict], hours: int = 24) -> List[ChannelVideo]:
+    def get_multiple_channels(self, channel_list: List[Dict], hours: int = 24,
+                              max_workers: int = 8) -> List[ChannelVideo]:
         """
         Get videos from multiple YouTube channels
-        
+
+        Each channel scrape is an independent handle-resolve plus RSS
+        fetch, so the channels run concurrently in a thread pool and
+        their network waits overlap.
+
         Args:
             channel_list: List of channel dictionaries with 'username' and optionally 'name'
             hours: Number of hours to look back
-            
+            max_workers: Number of channels to scrape concurrently
+
         Returns:
             Combined and sorted list of videos from all channels
         """
-        all_videos = []
-        
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        targets = []
         for channel_info in channel_list:
             username = channel_info.get('username') or channel_info.get('channel_id') or channel_info.get('id')
             channel_name = channel_info.get('name') or channel_info.get('channel_name')
-            
-            if not username:
-                continue
-            
-            try:
-                videos = self.get_channel_videos(username, hours, channel_name)
-                all_videos.extend(videos)
-            except Exception as e:
-                print(f"  ✗ Error processing channel {username}: {e}")
-                import traceback
-                traceback.print_exc()
-                continue
-        
+            if username:
+                targets.append((username, channel_name))
+
+        if not targets:
+            return []
+
+        all_videos = []
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(targets))) as executor:
+            futures = {
+                executor.submit(self.get_channel_videos, username, hours, channel_name): username
+                for username, channel_name in targets
+            }
+            for future in as_completed(futures):
+                username = futures[future]
+                try:
+                    all_videos.extend(future.result())
+                except Exception as e:
+                    print(f"  ✗ Error processing channel {username}: {e}")
+                    import traceback
+                    traceback.print_exc()
+
         all_videos.sort(key=lambda x: x.published_at, reverse=True)
         return all_videos
     
     # ==================== Transcript Fetching ====================
     
+    def _fetch_segments(self, video_id: str, languages: list) -> Optional[list]:
+        """
+        Fetch raw transcript segments for a video, via the disk cache
+
+        Both transcript entry points share this path, so a video fetched
+        through one (URL or ID, plain or timestamped) is a cache hit for
+        the other.
+        """
+        cache_key = f"{video_id}:{','.join(languages)}"
+        segments = _get_transcript_cache().get(cache_key)
+        if segments is not None:
+            return segments
+
+        # Disabled/missing transcripts are permanent - give up right
+        # away. Anything else (timeouts, 429s, connection resets) is
+        # usually transient, so retry a couple of times with a short
+        # exponential backoff before treating the video as unavailable.
+        for attempt in range(3):
+            try:
+                fetched_transcript = self.transcript_api.fetch(video_id, languages=languages)
+                segments = fetched_transcript.to_raw_data()
+                break
+            except (TranscriptsDisabled, NoTranscriptFound):
+                return None
+            except Exception:
+                if attempt == 2:
+                    return None
+                time.sleep(0.3 * (2 ** attempt))
+
+        _get_transcript_cache().put(cache_key, segments)
+        return segments
+
     def get_transcript(self, video_url_or_id: str, languages: list = None) -> Optional[Transcript]:
         """
         Get transcript for a YouTube video
-        
+
         Args:
             video_url_or_id: YouTube video URL or video ID
             languages: List of language codes in priority order (default: ['en'])
-            
+
         Returns:
             Transcript model with text, or None if unavailable
         """
         video_id = self.extract_video_id(video_url_or_id)
-        
+
         if languages is None:
             languages = ['en']
-        
-        try:
-            fetched_transcript = self.transcript_api.fetch(video_id, languages=languages)
-            transcript_text = ' '.join([snippet.text for snippet in fetched_transcript])
-            return Transcript(text=transcript_text)
-        except (TranscriptsDisabled, NoTranscriptFound):
-            return None
-        except Exception:
+
+        segments = self._fetch_segments(video_id, languages)
+        if segments is None:
             return None
-    
+        return Transcript(text=' '.join(segment['text'] for segment in segments))
+
     def get_transcript_with_timestamps(self, video_url_or_id: str, languages: list = None) -> Optional[list]:
         """
         Get transcript with timestamps for a YouTube video
-        
+
         Args:
             video_url_or_id: YouTube video URL or video ID
             languages: List of language codes in priority order (default: ['en'])
-            
+
         Returns:
             List of dictionaries with 'text', 'start', 'duration', or None if unavailable
         """
         video_id = self.extract_video_id(video_url_or_id)
-        
+
         if languages is None:
             languages = ['en']
-        
-        try:
-            fetched_transcript = self.transcript_api.fetch(video_id, languages=languages)
-            return fetched_transcript.to_raw_data()
-        except (TranscriptsDisabled, NoTranscriptFound):
-            return None
-        except Exception:
-            return None
+
+        return self._fetch_segments(video_id, languages)
     
     def fetch_transcript_for_video(self, video: ChannelVideo) -> Optional[str]:
         """
@@ -248,30 +363,45 @@ class YouTubeService:
             return transcript_obj.text
         return None
     
-    def fetch_transcripts_batch(self, videos: List[ChannelVideo]) -> List[ChannelVideo]:
+    def fetch_transcripts_batch(self, videos: List[ChannelVideo],
+                                max_workers: int = 8) -> List[ChannelVideo]:
         """
         Fetch transcripts for multiple videos in batch
-        
+
+        Each fetch is an independent network round-trip, so videos that
+        still need a transcript are fetched concurrently in a thread
+        pool; results keep the input order.
+
         Args:
             videos: List of ChannelVideo objects
-            
+            max_workers: Number of concurrent transcript fetches
+
         Returns:
             List of ChannelVideo objects with transcripts populated
         """
+        from concurrent.futures import ThreadPoolExecutor
+
+        to_fetch = [video for video in videos if video.transcript is None]
+        if not to_fetch:
+            return list(videos)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(to_fetch))) as executor:
+            transcripts = dict(zip(
+                (video.video_id for video in to_fetch),
+                executor.map(self.fetch_transcript_for_video, to_fetch)
+            ))
+
         updated_videos = []
         for video in videos:
-            if video.transcript is None:  # Only fetch if not already fetched
-                transcript_text = self.fetch_transcript_for_video(video)
-                if transcript_text:
-                    # Create new video object with transcript
-                    video_dict = video.model_dump()
-                    video_dict['transcript'] = transcript_text
-                    updated_videos.append(ChannelVideo(**video_dict))
-                else:
-                    updated_videos.append(video)  # Keep original if transcript unavailable
+            transcript_text = video.transcript or transcripts.get(video.video_id)
+            if transcript_text and video.transcript is None:
+                # Create new video object with transcript
+                video_dict = video.model_dump()
+                video_dict['transcript'] = transcript_text
+                updated_videos.append(ChannelVideo(**video_dict))
             else:
-                updated_videos.append(video)  # Already has transcript
-        
+                updated_videos.append(video)  # Already has transcript or none available
+
         return updated_videos
     
     # ==================== Utility Methods ====================
@@ -300,25 +430,25 @@ class YouTubeService:
             return identifier.split('/@')[-1].split('?')[0].split('/')[0].lstrip('@')
         return identifier.lstrip('@').strip()
     
+    @lru_cache(maxsize=512)
     def _resolve_to_channel_id(self, handle: str) -> Optional[str]:
-        """Resolve YouTube handle to channel ID"""
+        """
+        Resolve YouTube handle to channel ID
+
+        Results are cached per handle, so repeat lookups within a process
+        skip the HTTP round-trip.
+        """
         url = f"https://www.youtube.com/@{handle.lstrip('@')}"
-        
+
         try:
             response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
             response.raise_for_status()
-            
-            patterns = [
-                r'"channelId":"(UC[a-zA-Z0-9_-]{22})"',
-                r'"externalId":"(UC[a-zA-Z0-9_-]{22})"',
-                r'/channel/(UC[a-zA-Z0-9_-]{22})'
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, response.text)
+
+            for pattern in _CHANNEL_ID_PATTERNS:
+                match = pattern.search(response.text)
                 if match:
                     return match.group(1)
-            
+
             return None
         except Exception:
             return None
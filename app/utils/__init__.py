@@ -0,0 +1 @@
+"""Shared utilities"""
@@ -0,0 +1,39 @@
+"""Buffered logging for batch-processing scripts"""
+
+import logging
+import sys
+from logging.handlers import MemoryHandler
+
+
+def get_buffered_logger(name: str, capacity: int = 50, verbose: bool = False) -> logging.Logger:
+    """
+    Get a logger that buffers records and flushes them in batches
+
+    Per-item output in tight loops goes through an in-memory buffer that
+    flushes to stderr every `capacity` records (or immediately on WARNING
+    and above), instead of one stdout write per line. Per-item detail is
+    logged at DEBUG and only shown when verbose is True.
+
+    Args:
+        name: Logger name (usually __name__)
+        capacity: Number of records to buffer before flushing
+        verbose: Show per-item DEBUG output when True
+
+    Returns:
+        Configured logger
+    """
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        stream_handler = logging.StreamHandler(sys.stderr)
+        stream_handler.setFormatter(logging.Formatter("%(message)s"))
+        memory_handler = MemoryHandler(capacity, flushLevel=logging.WARNING, target=stream_handler)
+        logger.addHandler(memory_handler)
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def flush_logger(logger: logging.Logger) -> None:
+    """Flush any buffered records immediately"""
+    for handler in logger.handlers:
+        handler.flush()
@@ -0,0 +1,90 @@
+"""Sliding-window rate limiting for LLM API calls"""
+
+import threading
+import time
+from collections import deque
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a prompt
+
+    Uses the ~4 characters per token rule of thumb for English text, which
+    is close enough for rate limiting without pulling in a tokenizer
+    dependency.
+
+    Args:
+        text: Prompt text to estimate
+
+    Returns:
+        Estimated token count (at least 1)
+    """
+    return max(1, len(text) // 4)
+
+
+class SlidingWindow:
+    """
+    Sliding-window rate limiter enforcing RPM and TPM caps.
+
+    Tracks request timestamps and token counts over a rolling window;
+    acquire() blocks until both the requests-per-minute and
+    tokens-per-minute windows have capacity, then records the call.
+    Thread-safe, so a single instance can gate a whole worker pool.
+    """
+
+    def __init__(self, rpm: int = 60, tpm: int = 150_000, window_seconds: float = 60.0):
+        """
+        Initialize the rate limiter
+
+        Args:
+            rpm: Maximum requests per window (default: 60, OpenAI free tier)
+            tpm: Maximum tokens per window (default: 150,000)
+            window_seconds: Window length in seconds (default: 60)
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window_seconds = window_seconds
+        self._events = deque()  # (timestamp, tokens) pairs inside the window
+        self._window_tokens = 0
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        """Drop events that have fallen out of the window"""
+        cutoff = now - self.window_seconds
+        while self._events and self._events[0][0] <= cutoff:
+            _, tokens = self._events.popleft()
+            self._window_tokens -= tokens
+
+    def acquire(self, tokens: int = 1) -> None:
+        """
+        Block until there is capacity for a call, then record it
+
+        Args:
+            tokens: Estimated token cost of the call (see estimate_tokens)
+        """
+        # A cost above the whole window's budget could never be admitted
+        # and would spin in the wait loop forever; clamp it so oversized
+        # prompts (full transcripts embedded verbatim) serialize against
+        # an empty window instead of livelocking. The provider still
+        # meters real usage - this only keeps admission solvable.
+        tokens = min(tokens, self.tpm)
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._prune(now)
+
+                if len(self._events) < self.rpm and self._window_tokens + tokens <= self.tpm:
+                    self._events.append((now, tokens))
+                    self._window_tokens += tokens
+                    return
+
+                # Wait until the oldest event leaves the window
+                wait = self._events[0][0] + self.window_seconds - now if self._events else 0.1
+
+            time.sleep(max(wait, 0.05))
+
+
+# Shared limiter for OpenAI calls; all agents acquire from it so the
+# combined request rate stays under the provider's limits
+OPENAI_LIMITER = SlidingWindow(rpm=60, tpm=150_000)
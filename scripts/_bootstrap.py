@@ -0,0 +1,12 @@
+"""Shared sys.path bootstrap for scripts run directly from this directory
+
+Importing this module puts the project root on sys.path so scripts can
+import the app package without each repeating the path-insert idiom.
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
@@ -0,0 +1,75 @@
+"""Shared command-line parsing for the scripts in this directory"""
+
+import argparse
+
+import _bootstrap  # noqa: F401  (puts the project root on sys.path)
+
+EMAIL_FORMATS = ("text", "html", "both")
+
+
+def parse_email_args(description: str, with_format: bool = False, default_hours: int = 24):
+    """
+    Parse <email> [hours] [format] style arguments
+
+    Args:
+        description: Script description shown in --help
+        with_format: Accept an optional output format positional
+        default_hours: Default look-back window in hours
+
+    Returns:
+        Parsed argparse namespace (email, hours, and format if enabled)
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("email", help="User email address")
+    parser.add_argument(
+        "hours", nargs="?", type=int, default=default_hours,
+        help=f"Number of hours to look back (default: {default_hours})"
+    )
+    if with_format:
+        parser.add_argument(
+            "format", nargs="?", choices=EMAIL_FORMATS, default="text",
+            help="Output format (default: text)"
+        )
+    return parser.parse_args()
+
+
+def parse_batch_args(description: str, default_batch_size: int = 10,
+                     default_jobs: int = None, with_sample: bool = False):
+    """
+    Parse [limit] [-v] [--batch-size N] [--jobs N] style arguments
+
+    Args:
+        description: Script description shown in --help
+        default_batch_size: Default progress/flush batch size
+        default_jobs: Default worker count (omit the --jobs flag when None)
+        with_sample: Accept a --sample flag for random-subset dev runs
+
+    Returns:
+        Parsed argparse namespace (limit, verbose, batch_size, plus jobs
+        and sample if enabled)
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "limit", nargs="?", type=int, default=None,
+        help="Maximum number of items to process (default: all)"
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true",
+        help="Show per-item progress output"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=default_batch_size,
+        help=f"Items per progress/flush batch (default: {default_batch_size})"
+    )
+    if default_jobs is not None:
+        parser.add_argument(
+            "--jobs", type=int, default=default_jobs,
+            help=f"Number of concurrent workers (default: {default_jobs})"
+        )
+    if with_sample:
+        parser.add_argument(
+            "--sample", type=int, default=None, metavar="K",
+            help="Process only a random sample of K pending items per table "
+                 "(fast dev-loop iteration)"
+        )
+    return parser.parse_args()
@@ -0,0 +1,24 @@
+"""Shared network-reachability probe for the scripts in this directory"""
+
+import socket
+
+_reachable = None
+
+
+def youtube_reachable(timeout: float = 1.0) -> bool:
+    """
+    Fast check that YouTube is reachable before a network-touching test
+
+    Without network, each test would otherwise burn a full socket
+    timeout per request before failing; one sub-second TCP probe lets
+    the tests skip instead. The result is cached for the process so
+    sibling tests share a single probe.
+    """
+    global _reachable
+    if _reachable is None:
+        try:
+            socket.create_connection(("www.youtube.com", 443), timeout=timeout).close()
+            _reachable = True
+        except OSError:
+            _reachable = False
+    return _reachable
@@ -6,6 +6,13 @@
 
 import sys
 import os
+import argparse
+import json
+import traceback
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
@@ -24,32 +31,45 @@ print(f"[STARTUP] Script path: {__file__}")
 sys.stdout.flush()
 
 from app.runner import run_aggregator
-from app.database.connection import get_db_session
+from app.database.connection import get_db_session, session_scope
 from app.database.repository import (
     ArticleRepository, VideoRepository, DigestRepository, UserSettingsRepository
 )
 from app.agents.digest_agent import DigestAgent
 from app.agents.news_anchor_agent import NewsAnchorAgent
 from app.agents.email_agent import EmailAgent
+from app.services.embedding_service import EmbeddingService, cosine_similarity
 from app.profiles.user_profile import UserProfile
+from app.utils.batch_logging import get_buffered_logger, flush_logger
 
+# Concurrency caps: the producer pool stays under OpenAI's RPM tier while
+# the SMTP worker count stays well below Gmail's simultaneous-connection limit
+DEFAULT_RANKING_CONCURRENCY = 8
+SMTP_WORKER_COUNT = 5
 
-def scrape_and_save(hours: int = 24):
+# How many similarity-ranked digests to hand the LLM reranker per user
+RERANK_TOP_K = 30
+
+logger = get_buffered_logger(__name__)
+
+
+def scrape_and_save(hours: int = 24, db=None):
     """
     Step 1: Scrape content and save to database
-    
+
     Args:
         hours: Number of hours to look back
-        
+        db: Optional existing database session to reuse
+
     Returns:
         Dictionary with scraping results
     """
     print("\n" + "=" * 70)
     print("STEP 1: Scraping Content and Saving to Database")
     print("=" * 70)
-    
+
     try:
-        results = run_aggregator(hours=hours, fetch_transcripts=False, save_to_db=True)
+        results = run_aggregator(hours=hours, fetch_transcripts=False, save_to_db=True, db=db)
         
         print(f"\n✓ Scraping complete:")
         print(f"  Articles found: {len(results.get('articles', []))}")
@@ -58,21 +78,25 @@ def scrape_and_save(hours: int = 24):
         return results
     except Exception as e:
         print(f"\n✗ Error during scraping: {e}")
-        import traceback
         traceback.print_exc()
         return None
 
 
-def generate_digests(batch_size: int = 10):
+def generate_digests(batch_size: int = 10, verbose: bool = False, db=None):
     """
     Step 2: Generate digests for items without them
-    
+
     Args:
         batch_size: Number of items to process before showing progress
-        
+        verbose: Show per-item progress output (default: False)
+        db: Optional existing database session to reuse (a session is
+            opened and closed here if omitted)
+
     Returns:
         Tuple of (successful_count, failed_count)
     """
+    get_buffered_logger(__name__, capacity=batch_size, verbose=verbose)
+
     print("\n" + "=" * 70)
     print("STEP 2: Generating Digests")
     print("=" * 70)
@@ -85,24 +109,29 @@ def generate_digests(batch_size: int = 10):
         print(f"✗ Error initializing digest agent: {e}")
         print("Make sure OPENAI_API_KEY is set in your .env file")
         return (0, 0)
-    
-    db_gen = get_db_session()
-    db = next(db_gen)
-    
+
+    owns_session = db is None
+    if owns_session:
+        db_gen = get_db_session()
+        db = next(db_gen)
+
     try:
-        # Get items without digests
-        articles = ArticleRepository.get_all(db)
-        videos = VideoRepository.get_all(db)
-        
-        articles_to_process = [
-            a for a in articles 
-            if not DigestRepository.exists_by_url(db, a.url)
-        ]
-        videos_to_process = [
-            v for v in videos 
-            if not DigestRepository.exists_by_url(db, v.url)
-        ]
-        
+        # Scan candidates without their large text columns, filter out URLs
+        # that already have a digest in one bulk query, then fetch the full
+        # rows (markdown/transcript included) only for the survivors
+        article_candidates = ArticleRepository.get_candidates(db)
+        video_candidates = VideoRepository.get_candidates(db)
+
+        candidate_urls = [a.url for a in article_candidates] + [v.url for v in video_candidates]
+        existing_urls = DigestRepository.get_existing_urls(db, candidate_urls)
+
+        articles_to_process = ArticleRepository.get_by_ids(
+            db, [a.id for a in article_candidates if a.url not in existing_urls]
+        )
+        videos_to_process = VideoRepository.get_by_ids(
+            db, [v.id for v in video_candidates if v.url not in existing_urls]
+        )
+
         total_count = len(articles_to_process) + len(videos_to_process)
         
         if total_count == 0:
@@ -114,14 +143,36 @@ def generate_digests(batch_size: int = 10):
         
         successful = 0
         failed = 0
+        pending_digests = []  # Buffered rows, flushed in bulk every batch_size
+        
+        def flush_digests():
+            if not pending_digests:
+                return
+            try:
+                DigestRepository.bulk_create(db, list(pending_digests))
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"  ⚠ Bulk digest insert failed ({e}); retrying rows individually")
+                for row in pending_digests:
+                    try:
+                        DigestRepository.create(
+                            db, url=row['url'], title=row['title'],
+                            summary=row['summary'], content_type=row['content_type'],
+                            article_id=row.get('article_id'), video_id=row.get('video_id'),
+                            published_at=row.get('created_at')
+                        )
+                    except Exception as row_error:
+                        logger.warning(f"  ✗ Error inserting digest for {row['url']}: {row_error}")
+                        db.rollback()
+            finally:
+                pending_digests.clear()
         
         def process_item(item, item_type: str, item_id: int):
             nonlocal successful, failed
             processed = successful + failed + 1
             
             try:
-                if processed % batch_size == 0 or processed == 1:
-                    print(f"[{processed}/{total_count}] Processing {item_type}: {item.title[:60]}...")
+                logger.debug(f"[{processed}/{total_count}] Processing {item_type}: {item.title[:60]}...")
                 
                 if item_type == "article":
                     digest_output = agent.generate_digest_from_article(
@@ -129,32 +180,34 @@ def generate_digests(batch_size: int = 10):
                         description=item.description or "",
                         markdown_content=item.markdown_content
                     )
-                    DigestRepository.create(
-                        db, url=item.url, title=digest_output.title,
-                        summary=digest_output.summary, content_type="article",
-                        article_id=item_id, published_at=item.published_at
-                    )
+                    pending_digests.append({
+                        "url": item.url, "title": digest_output.title,
+                        "summary": digest_output.summary, "content_type": "article",
+                        "article_id": item_id, "created_at": item.published_at
+                    })
                 else:  # video
                     digest_output = agent.generate_digest_from_video(
                         title=item.title,
                         description=item.description or "",
                         transcript=item.transcript
                     )
-                    DigestRepository.create(
-                        db, url=item.url, title=digest_output.title,
-                        summary=digest_output.summary, content_type="video",
-                        video_id=item_id, published_at=item.published_at
-                    )
+                    pending_digests.append({
+                        "url": item.url, "title": digest_output.title,
+                        "summary": digest_output.summary, "content_type": "video",
+                        "video_id": item_id, "created_at": item.published_at
+                    })
                 
                 successful += 1
                 
+                if len(pending_digests) >= batch_size:
+                    flush_digests()
+                
                 if processed % batch_size == 0:
                     print(f"  Progress: {successful} successful, {failed} failed\n")
                 
             except Exception as e:
                 failed += 1
-                if processed % batch_size == 0:
-                    print(f"  ✗ Error: {e}")
+                logger.warning(f"  ✗ Error: {e}")
                 db.rollback()
         
         for article in articles_to_process:
@@ -163,6 +216,10 @@ def generate_digests(batch_size: int = 10):
         for video in videos_to_process:
             process_item(video, "video", video.id)
         
+        # Flush any remaining buffered digests
+        flush_digests()
+        flush_logger(logger)
+        
         print(f"\n✓ Digest generation complete:")
         print(f"  Successful: {successful}")
         print(f"  Failed: {failed}")
@@ -171,32 +228,232 @@ def generate_digests(batch_size: int = 10):
         
     except Exception as e:
         print(f"\n✗ Error during digest generation: {e}")
-        import traceback
         traceback.print_exc()
         return (0, 0)
     finally:
-        db.close()
+        if owns_session:
+            db.close()
 
 
-def send_email_digests(hours: int = 24, use_html: bool = True):
+def _ensure_digest_embeddings(db, embedding_service, digests):
+    """
+    Compute and store embeddings for digests that don't have one yet
+    
+    Embeddings are computed once per digest (single batched API call) and
+    persisted, so repeat runs and other users reuse them.
+    """
+    missing = [d for d in digests if not d.embedding]
+    if not missing:
+        return
+    
+    texts = [f"{d.title}\n{d.summary}" for d in missing]
+    embeddings = embedding_service.embed_texts(texts)
+    for digest, vector in zip(missing, embeddings):
+        DigestRepository.update_embedding(db, digest.id, vector)
+
+
+def _prefilter_digests(db, embedding_service, digests, profile, top_k: int = RERANK_TOP_K):
+    """
+    Keep only the top_k digests most similar to the user's profile
+    
+    A cheap embedding cosine pass bounds how many items the per-user LLM
+    reranking call has to score. Falls back to the full list if embeddings
+    can't be computed.
+    
+    Args:
+        db: Database session
+        embedding_service: EmbeddingService instance
+        digests: Candidate Digest rows for this user
+        profile: User profile dict (may be None)
+        top_k: Number of digests to keep
+        
+    Returns:
+        List of up to top_k Digest rows, most similar first
+    """
+    try:
+        _ensure_digest_embeddings(db, embedding_service, digests)
+        
+        if profile and (profile.get('background') or profile.get('interests')):
+            profile_text = f"{profile.get('background', '')}\n{profile.get('interests', '')}"
+        else:
+            profile_text = "General interest\nTechnology, news, current events"
+        profile_vector = embedding_service.embed_text(profile_text)
+        
+        def similarity(digest):
+            if not digest.embedding:
+                return -1.0
+            return cosine_similarity(json.loads(digest.embedding), profile_vector)
+        
+        return sorted(digests, key=similarity, reverse=True)[:top_k]
+    except Exception as e:
+        print(f"  ⚠ Similarity pre-ranking failed ({e}); using full digest list")
+        return digests
+
+
+def _make_ranker(ranking_agent, work_items):
+    """
+    Build a memoized per-run ranking function
+
+    Users who share the same digest set and profile text (common when the
+    default background/interests apply) would otherwise trigger identical
+    rank_digests LLM calls. Memoizing on (digest_ids, background,
+    interests) turns the repeats into cache hits; the ranking prompt is
+    profile-driven, so the user's name is not part of the key.
+
+    Args:
+        ranking_agent: Shared NewsAnchorAgent instance
+        work_items: Per-user work items (used to resolve digest data by key)
+
+    Returns:
+        Callable of (digest_ids, background, interests) -> ranking output
+    """
+    digest_data_by_key = {
+        tuple(d['id'] for d in item["digest_data"]): item["digest_data"]
+        for item in work_items
+    }
+
+    @lru_cache(maxsize=128)
+    def _ranked(digest_ids, background, interests):
+        return ranking_agent.rank_digests(
+            digests=digest_data_by_key[digest_ids],
+            name="",
+            background=background,
+            interests=interests
+        )
+
+    return _ranked
+
+
+def _prepare_user_email(rank_fn, email_agent, work_item):
+    """
+    Rank one user's digests and generate their email content
+
+    Runs in a producer worker thread; only makes network (LLM) calls,
+    no database access.
+
+    Args:
+        rank_fn: Memoized ranking function from _make_ranker
+        email_agent: Shared EmailAgent instance
+        work_item: Dict with 'email', 'profile', and 'digest_data' keys
+
+    Returns:
+        Tuple of (user_email, email_content, ranked_items)
+    """
+    user_email = work_item["email"]
+    profile = work_item["profile"]
+    digest_data = work_item["digest_data"]
+
+    user_name = None
+    if profile:
+        user_name = profile.get('name') if profile.get('name') and profile.get('name').strip() else None
+
+    # Rank digests (memoized across users sharing the same inputs)
+    digest_ids = tuple(d['id'] for d in digest_data)
+    if profile and profile.get('background') and profile.get('interests'):
+        ranking = rank_fn(digest_ids, profile.get('background', ''), profile.get('interests', ''))
+    else:
+        # Default ranking
+        ranking = rank_fn(digest_ids, "General interest", "Technology, news, current events")
+    
+    # Prepare ranked items (index digests by URL once for O(1) lookups)
+    digest_by_url = {d['url']: d for d in digest_data}
+    ranked_items = [
+        {
+            "rank": item.rank,
+            "title": item.title,
+            "summary": digest_by_url.get(item.url, {}).get('summary', ""),
+            "url": item.url,
+            "relevance_score": item.relevance_score,
+            "content_type": digest_by_url.get(item.url, {}).get('content_type', "unknown")
+        }
+        for item in ranking.ranked_items[:10]  # Top 10
+    ]
+    
+    # Generate email content
+    email_content = email_agent.generate_email_content(
+        user_name=user_name,
+        ranked_items=ranked_items,
+        date=datetime.now()
+    )
+    
+    return (user_email, email_content, ranked_items)
+
+
+def _smtp_send_worker(email_agent, send_queue, results, use_html: bool):
+    """
+    Consumer worker: send queued emails over one persistent SMTP connection
+    
+    Each worker holds its own authenticated SMTP session for its lifetime.
+    Pulls (user_email, email_content, ranked_items) tuples from the queue
+    until it receives a None sentinel. Outcomes are appended to results as
+    (user_email, ranked_items, error_or_none).
+    
+    Args:
+        email_agent: Shared EmailAgent (used only for pure formatting)
+        send_queue: Queue of prepared emails (None = shut down)
+        results: Thread-safe list collecting send outcomes
+        use_html: Whether to include the HTML body
+    """
+    from app.services.smtp_service import SMTPService
+    
+    smtp_service = SMTPService()
+    smtp_service.connect()
+    try:
+        while True:
+            item = send_queue.get()
+            if item is None:
+                break
+            user_email, email_content, ranked_items = item
+            try:
+                body_text = email_agent.format_email_text(email_content)
+                body_html = email_agent.format_email_html(email_content) if use_html else None
+                subject = f"Your Daily News Digest - {email_content.date_line}"
+                smtp_service.send_email(
+                    to=user_email,
+                    subject=subject,
+                    body_text=body_text,
+                    body_html=body_html
+                )
+                results.append((user_email, ranked_items, None))
+                print(f"  ✓ Email sent to {user_email}")
+            except Exception as e:
+                results.append((user_email, ranked_items, e))
+                print(f"  ✗ Failed to send email to {user_email}: {e}")
+    finally:
+        smtp_service.close()
+
+
+def send_email_digests(hours: int = 24, use_html: bool = True,
+                       concurrency: int = DEFAULT_RANKING_CONCURRENCY, db=None):
     """
     Step 3: Send email digests to all users
     
+    Per-user work is pipelined: a producer thread pool runs the (slow,
+    network-bound) LLM ranking + email generation, feeding a queue consumed
+    by a small pool of SMTP workers that each hold a persistent connection.
+    Database reads/writes stay on the main thread since sessions are not
+    thread-safe.
+    
     Args:
         hours: Number of hours to look back for digests
         use_html: Whether to send HTML emails
-        
+        concurrency: Number of concurrent ranking/generation workers
+        db: Optional existing database session to reuse (a session is
+            opened and closed here if omitted)
+
     Returns:
         Dictionary with sending results
     """
     print("\n" + "=" * 70)
     print("STEP 3: Sending Email Digests")
     print("=" * 70)
-    
+
     # Get all users from database
-    db_gen = get_db_session()
-    db = next(db_gen)
-    
+    owns_session = db is None
+    if owns_session:
+        db_gen = get_db_session()
+        db = next(db_gen)
+
     try:
         users = UserSettingsRepository.get_all(db)
         
@@ -216,32 +473,48 @@ def send_email_digests(hours: int = 24, use_html: bool = True):
             print(f"✗ Error initializing agents: {e}")
             return {"sent": 0, "failed": 0, "total": len(users)}
         
-        sent_count = 0
-        failed_count = 0
+        # Embedding service for cheap similarity pre-ranking (optional; the
+        # full digest list goes to the LLM reranker if unavailable)
+        try:
+            embedding_service = EmbeddingService()
+        except Exception as e:
+            embedding_service = None
+            print(f"  ⚠ Embeddings unavailable ({e}); skipping similarity pre-ranking")
         
-        # Send email to each user
+        # Profiles live on the user_settings rows already loaded above;
+        # build the lookup from them instead of re-querying by email
+        profiles = {user.email: UserProfile.to_dict(user) for user in users}
+
+        # Fetch the recent digest window once for the whole run; per user we
+        # only need the set of already-sent IDs to filter it
+        recent_digests = DigestRepository.get_recent(db, hours=hours)
+
+        # Gather per-user work on the main thread (DB access)
+        work_items = []
         for user in users:
             user_email = user.email
-            print(f"\nProcessing user: {user_email}")
             
-            try:
-                # Get digests that haven't been sent to this user yet
-                digests = DigestRepository.get_recent_not_sent_to_user(db, user_email, hours=hours)
-                
-                if not digests:
-                    print(f"  ⚠ No new digests for {user_email} (all digests already sent)")
-                    continue
-                
-                print(f"  Found {len(digests)} new digests for {user_email}")
-                
-                # Get user profile
-                profile = UserProfile.get_profile(user_email)
-                user_name = None
-                if profile:
-                    user_name = profile.get('name') if profile.get('name') and profile.get('name').strip() else None
-                
-                # Prepare digest data for ranking
-                digest_data = [
+            # Filter out digests already sent to this user
+            sent_ids = DigestRepository.get_sent_digest_ids(db, user_email)
+            digests = [d for d in recent_digests if d.id not in sent_ids]
+            
+            if not digests:
+                print(f"  ⚠ No new digests for {user_email} (all digests already sent)")
+                continue
+            
+            print(f"  Found {len(digests)} new digests for {user_email}")
+            
+            profile = profiles.get(user_email)
+            
+            # Pre-rank by embedding similarity so the LLM only reranks top-K
+            if embedding_service and len(digests) > RERANK_TOP_K:
+                digests = _prefilter_digests(db, embedding_service, digests, profile)
+                print(f"  Pre-ranked to top {len(digests)} digests by profile similarity")
+            
+            work_items.append({
+                "email": user_email,
+                "profile": profile,
+                "digest_data": [
                     {
                         "id": d.id,
                         "url": d.url,
@@ -251,70 +524,65 @@ def send_email_digests(hours: int = 24, use_html: bool = True):
                     }
                     for d in digests
                 ]
-                
-                # Rank digests
-                if profile and profile.get('background') and profile.get('interests'):
-                    ranking = ranking_agent.rank_digests(
-                        digests=digest_data,
-                        name=user_name or "",
-                        background=profile.get('background', ''),
-                        interests=profile.get('interests', '')
-                    )
-                else:
-                    # Default ranking
-                    ranking = ranking_agent.rank_digests(
-                        digests=digest_data,
-                        name=user_name or "",
-                        background="General interest",
-                        interests="Technology, news, current events"
-                    )
-                
-                # Prepare ranked items
-                ranked_items = [
-                    {
-                        "rank": item.rank,
-                        "title": item.title,
-                        "summary": next((d['summary'] for d in digest_data if d['url'] == item.url), ""),
-                        "url": item.url,
-                        "relevance_score": item.relevance_score,
-                        "content_type": next((d['content_type'] for d in digest_data if d['url'] == item.url), "unknown")
-                    }
-                    for item in ranking.ranked_items[:10]  # Top 10
-                ]
-                
-                # Generate email content
-                email_content = email_agent.generate_email_content(
-                    user_name=user_name,
-                    ranked_items=ranked_items,
-                    date=datetime.now()
-                )
-                
-                # Send email
-                result = email_agent.send_email(
-                    to=user_email,
-                    email_content=email_content,
-                    use_html=use_html
-                )
-                
-                if result:
-                    sent_count += 1
-                    print(f"  ✓ Email sent successfully")
-                    # Mark digests as sent to this user
-                    for item in ranked_items:
-                        digest = DigestRepository.get_by_url(db, item['url'])
-                        if digest:
-                            DigestRepository.mark_as_sent(db, digest.id, user_email)
-                    print(f"  ✓ Marked {len(ranked_items)} digests as sent to {user_email}")
-                else:
-                    failed_count += 1
-                    print(f"  ✗ Failed to send email")
-                    
-            except Exception as e:
+            })
+        
+        if not work_items:
+            print("\n✓ Nothing to send")
+            return {"sent": 0, "failed": 0, "total": len(users)}
+        
+        sent_count = 0
+        failed_count = 0
+
+        rank_fn = _make_ranker(ranking_agent, work_items)
+
+        # Pipeline: producer pool (LLM rank + generate) -> queue -> SMTP workers
+        send_queue = queue.Queue()
+        results = []  # list.append is thread-safe
+        
+        smtp_worker_count = min(SMTP_WORKER_COUNT, len(work_items))
+        smtp_workers = [
+            threading.Thread(
+                target=_smtp_send_worker,
+                args=(email_agent, send_queue, results, use_html),
+                daemon=True
+            )
+            for _ in range(smtp_worker_count)
+        ]
+        for worker in smtp_workers:
+            worker.start()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+                futures = {
+                    executor.submit(_prepare_user_email, rank_fn, email_agent, item): item["email"]
+                    for item in work_items
+                }
+                for future in as_completed(futures):
+                    user_email = futures[future]
+                    try:
+                        send_queue.put(future.result())
+                    except Exception as e:
+                        failed_count += 1
+                        print(f"  ✗ Error preparing email for {user_email}: {e}")
+        finally:
+            # Signal SMTP workers to shut down and wait for the queue to drain
+            for _ in smtp_workers:
+                send_queue.put(None)
+            for worker in smtp_workers:
+                worker.join()
+        
+        # Record outcomes on the main thread (DB access)
+        for user_email, ranked_items, error in results:
+            if error is not None:
                 failed_count += 1
-                print(f"  ✗ Error sending email: {e}")
-                import traceback
-                traceback.print_exc()
                 continue
+            sent_count += 1
+            # Mark digests as sent to this user
+            for item in ranked_items:
+                digest = DigestRepository.get_by_url(db, item['url'])
+                if digest:
+                    DigestRepository.mark_as_sent(db, digest.id, user_email)
+            print(f"  ✓ Marked {len(ranked_items)} digests as sent to {user_email}")
         
         print(f"\n✓ Email sending complete:")
         print(f"  Sent: {sent_count}")
@@ -329,22 +597,25 @@ def send_email_digests(hours: int = 24, use_html: bool = True):
         
     except Exception as e:
         print(f"\n✗ Error during email sending: {e}")
-        import traceback
         traceback.print_exc()
         return {"sent": 0, "failed": 0, "total": 0}
     finally:
-        db.close()
+        if owns_session:
+            db.close()
 
 
-def run_daily_pipeline(hours: int = 24, use_html: bool = True, skip_scraping: bool = False):
+def run_daily_pipeline(hours: int = 24, use_html: bool = True, skip_scraping: bool = False,
+                       concurrency: int = DEFAULT_RANKING_CONCURRENCY, verbose: bool = False):
     """
     Run the complete daily pipeline
-    
+
     Args:
         hours: Number of hours to look back for content
         use_html: Whether to send HTML emails
         skip_scraping: Skip scraping step (useful for testing)
-        
+        concurrency: Number of concurrent ranking/email-generation workers
+        verbose: Show per-item progress output
+
     Returns:
         Dictionary with pipeline results
     """
@@ -365,29 +636,33 @@ def run_daily_pipeline(hours: int = 24, use_html: bool = True, skip_scraping: bo
         "success": False
     }
     
-    # Step 1: Scrape and save
-    if not skip_scraping:
-        scraping_results = scrape_and_save(hours=hours)
-        results["scraping"] = scraping_results
-        if scraping_results is None:
-            print("\n✗ Pipeline stopped due to scraping errors")
-            return results
-    else:
-        print("\n" + "=" * 70)
-        print("STEP 1: Scraping (SKIPPED)")
-        print("=" * 70)
-        print("✓ Skipping scraping step")
-    
-    # Step 2: Generate digests
-    successful_digests, failed_digests = generate_digests()
-    results["digests"] = {
-        "successful": successful_digests,
-        "failed": failed_digests
-    }
-    
-    # Step 3: Send emails
-    email_results = send_email_digests(hours=hours, use_html=use_html)
-    results["emails"] = email_results
+    # One session checked out for the whole pipeline; each step reuses it
+    # instead of opening (and closing) its own
+    with session_scope() as db:
+        # Step 1: Scrape and save
+        if not skip_scraping:
+            scraping_results = scrape_and_save(hours=hours, db=db)
+            results["scraping"] = scraping_results
+            if scraping_results is None:
+                print("\n✗ Pipeline stopped due to scraping errors")
+                return results
+        else:
+            print("\n" + "=" * 70)
+            print("STEP 1: Scraping (SKIPPED)")
+            print("=" * 70)
+            print("✓ Skipping scraping step")
+
+        # Step 2: Generate digests
+        successful_digests, failed_digests = generate_digests(verbose=verbose, db=db)
+        results["digests"] = {
+            "successful": successful_digests,
+            "failed": failed_digests
+        }
+
+        # Step 3: Send emails
+        email_results = send_email_digests(hours=hours, use_html=use_html,
+                                           concurrency=concurrency, db=db)
+        results["emails"] = email_results
     
     # Final summary
     end_time = datetime.now()
@@ -412,8 +687,6 @@ def run_daily_pipeline(hours: int = 24, use_html: bool = True, skip_scraping: bo
 
 def main():
     """Main entry point"""
-    import argparse
-    
     try:
         print("[MAIN] Starting daily runner script")
         sys.stdout.flush()
@@ -435,10 +708,21 @@ def main():
             action="store_true",
             help="Skip the scraping step (useful for testing)"
         )
-        
+        parser.add_argument(
+            "--verbose",
+            action="store_true",
+            help="Show per-item progress output in tight loops"
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=DEFAULT_RANKING_CONCURRENCY,
+            help=f"Number of concurrent ranking/email-generation workers (default: {DEFAULT_RANKING_CONCURRENCY})"
+        )
+
         args = parser.parse_args()
-        
-        print(f"[MAIN] Arguments: hours={args.hours}, text={args.text}, skip_scraping={args.skip_scraping}")
+
+        print(f"[MAIN] Arguments: hours={args.hours}, text={args.text}, skip_scraping={args.skip_scraping}, concurrency={args.concurrency}")
         sys.stdout.flush()
         
         # Check critical environment variables
@@ -451,11 +735,21 @@ def main():
         
         print("[MAIN] Environment variables check passed")
         sys.stdout.flush()
-        
+
+        # Apply idempotent schema setup (create_all plus column
+        # additions) so the deployed cron picks up model changes without
+        # a manual ALTER TABLE on the managed database
+        from app.database.connection import init_db
+        init_db()
+        print("[MAIN] Database schema check passed")
+        sys.stdout.flush()
+
         run_daily_pipeline(
             hours=args.hours,
             use_html=not args.text,
-            skip_scraping=args.skip_scraping
+            skip_scraping=args.skip_scraping,
+            concurrency=args.concurrency,
+            verbose=args.verbose
         )
         
         print("[MAIN] Script completed successfully")
@@ -463,7 +757,6 @@ def main():
         
     except Exception as e:
         print(f"[FATAL ERROR] Unhandled exception in main: {e}")
-        import traceback
         traceback.print_exc()
         sys.stdout.flush()
         sys.stderr.flush()
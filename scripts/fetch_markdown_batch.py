@@ -1,24 +1,79 @@
 """Script to fetch markdown content for articles in the database that don't have it"""
 
-import sys
-from pathlib import Path
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import _bootstrap  # noqa: F401  (puts the project root on sys.path)
+from _cli import parse_batch_args
 
 from app.database.connection import get_db_session
+from app.database.models import Article
 from app.database.repository import ArticleRepository
 from app.scrapers.openai_news_scraper import get_url_content_as_markdown
+from app.utils.batch_logging import get_buffered_logger, flush_logger
 
+# Number of pending markdown updates to accumulate before one bulk UPDATE
+BULK_FLUSH_SIZE = 50
 
-def fetch_markdown_batch(limit: int = None, batch_size: int = 10):
+
+def _iter_chunks(iterable, size: int):
+    """Yield lists of up to size items from an iterable"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _flush_markdown_updates(db, pending):
+    """
+    Write pending markdown updates in one bulk UPDATE + commit
+    
+    Falls back to per-row updates on failure so one bad row doesn't lose
+    the whole batch.
+    """
+    if not pending:
+        return
+    try:
+        db.bulk_update_mappings(Article, pending)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"  ⚠ Bulk update failed ({e}); retrying rows individually")
+        for mapping in pending:
+            try:
+                ArticleRepository.update_markdown(db, mapping['id'], mapping['markdown_content'])
+            except Exception as row_error:
+                logger.warning(f"  ✗ Error updating article {mapping['id']}: {row_error}")
+                db.rollback()
+    finally:
+        pending.clear()
+
+
+logger = get_buffered_logger(__name__, capacity=BULK_FLUSH_SIZE)
+
+
+def fetch_markdown_batch(limit: int = None, batch_size: int = 10, max_workers: int = 10,
+                         verbose: bool = False):
     """
     Fetch markdown content for articles that don't have it
     
+    Fetches run concurrently in a thread pool (the work is network-bound,
+    so the speedup is near-linear up to max_workers); database updates stay
+    on the main thread as results complete.
+    
     Args:
         limit: Maximum number of articles to process (None for all)
         batch_size: Number of articles to process before showing progress
+        max_workers: Maximum concurrent markdown fetches (default: 10)
+        verbose: Show per-article progress output (default: False)
     """
+    get_buffered_logger(__name__, capacity=batch_size, verbose=verbose)
+
     print("=" * 70)
     print("Fetching Markdown Content for Articles")
     print("=" * 70)
@@ -28,10 +83,13 @@ def fetch_markdown_batch(limit: int = None, batch_size: int = 10):
     db = next(db_gen)
     
     try:
-        # Get articles without markdown
-        articles = ArticleRepository.get_without_markdown(db, limit=limit)
-        total_count = len(articles)
-        
+        # Count first, then stream articles without markdown (keeps memory
+        # bounded for large backlogs)
+        total_count = ArticleRepository.count_without_markdown(db)
+        if limit:
+            total_count = min(total_count, limit)
+        articles = ArticleRepository.iter_without_markdown(db, limit=limit)
+
         if total_count == 0:
             print("\n✓ All articles already have markdown content!")
             return
@@ -41,33 +99,53 @@ def fetch_markdown_batch(limit: int = None, batch_size: int = 10):
         
         successful = 0
         failed = 0
+        processed = 0
+        pending = []  # Buffered updates, flushed every BULK_FLUSH_SIZE rows
         
-        for i, article in enumerate(articles, 1):
-            try:
-                print(f"[{i}/{total_count}] Processing: {article.title[:60]}...")
-                print(f"  URL: {article.url}")
-                
-                # Fetch markdown content
-                markdown_content = get_url_content_as_markdown(article.url)
-                
-                if markdown_content:
-                    # Update article in database
-                    ArticleRepository.update_markdown(db, article.id, markdown_content)
-                    successful += 1
-                    print(f"  ✓ Successfully fetched markdown ({len(markdown_content)} chars)")
-                else:
-                    failed += 1
-                    print(f"  ✗ Failed to fetch markdown content")
-                
-                # Show progress every batch_size articles
-                if i % batch_size == 0:
-                    print(f"\n  Progress: {successful} successful, {failed} failed\n")
-                    
-            except Exception as e:
-                failed += 1
-                print(f"  ✗ Error: {e}")
-                db.rollback()  # Rollback on error
-                continue
+        # Submit fetches in bounded waves so the streamed query stays lazy
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for chunk in _iter_chunks(articles, max_workers * 2):
+                futures = {
+                    executor.submit(get_url_content_as_markdown, article.url): article
+                    for article in chunk
+                }
+                for future in as_completed(futures):
+                    article = futures[future]
+                    processed += 1
+                    try:
+                        logger.debug(f"[{processed}/{total_count}] Processing: {article.title[:60]}...")
+                        logger.debug(f"  URL: {article.url}")
+                        
+                        markdown_content = future.result()
+                        
+                        if markdown_content:
+                            # Buffer the update; flushed in bulk below
+                            pending.append({
+                                'id': article.id,
+                                'markdown_content': markdown_content,
+                                'markdown_fetched_at': datetime.now(timezone.utc)
+                            })
+                            if len(pending) >= BULK_FLUSH_SIZE:
+                                _flush_markdown_updates(db, pending)
+                            successful += 1
+                            logger.debug(f"  ✓ Successfully fetched markdown ({len(markdown_content)} chars)")
+                        else:
+                            failed += 1
+                            logger.debug(f"  ✗ Failed to fetch markdown content")
+                        
+                        # Show progress every batch_size articles
+                        if processed % batch_size == 0:
+                            print(f"\n  Progress: {successful} successful, {failed} failed\n")
+                            
+                    except Exception as e:
+                        failed += 1
+                        logger.warning(f"  ✗ Error: {e}")
+                        db.rollback()  # Rollback on error
+                        continue
+        
+        # Flush any remaining buffered updates
+        _flush_markdown_updates(db, pending)
+        flush_logger(logger)
         
         print("\n" + "=" * 70)
         print("Summary")
@@ -79,7 +157,6 @@ def fetch_markdown_batch(limit: int = None, batch_size: int = 10):
         
     except Exception as e:
         print(f"\n✗ Error: {e}")
-        import traceback
         traceback.print_exc()
     finally:
         db.close()
@@ -87,14 +164,9 @@ def fetch_markdown_batch(limit: int = None, batch_size: int = 10):
 
 def main():
     """Main entry point"""
-    limit = None
-    if len(sys.argv) > 1:
-        try:
-            limit = int(sys.argv[1])
-        except ValueError:
-            print(f"Invalid limit value: {sys.argv[1]}. Processing all articles.")
-    
-    fetch_markdown_batch(limit=limit)
+    args = parse_batch_args("Fetch markdown content for articles missing it", default_jobs=10)
+    fetch_markdown_batch(limit=args.limit, batch_size=args.batch_size,
+                         max_workers=args.jobs, verbose=args.verbose)
 
 
 if __name__ == "__main__":
@@ -1,28 +1,69 @@
 """Script to fetch transcripts for videos in the database that don't have them"""
 
-import sys
-from pathlib import Path
+import traceback
+from datetime import datetime, timezone
 
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import _bootstrap  # noqa: F401  (puts the project root on sys.path)
+from _cli import parse_batch_args
 
 from app.database.connection import get_db_session
+from app.database.models import Video, TRANSCRIPT_UNAVAILABLE
 from app.database.repository import VideoRepository
 from app.services.youtube_service import YouTubeService
+from app.utils.batch_logging import get_buffered_logger, flush_logger
 from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound
 
-# Constant for unavailable transcripts
-TRANSCRIPT_UNAVAILABLE = "transcript is not available"
+# Number of pending transcript updates to accumulate before one bulk UPDATE
+BULK_FLUSH_SIZE = 50
 
+logger = get_buffered_logger(__name__, capacity=BULK_FLUSH_SIZE)
 
-def fetch_transcripts_batch(limit: int = None, batch_size: int = 10):
+
+def _flush_transcript_updates(db, pending):
+    """
+    Write pending transcript updates in one bulk UPDATE + commit
+    
+    Falls back to per-row updates on failure so one bad row doesn't lose
+    the whole batch.
+    """
+    if not pending:
+        return
+    try:
+        db.bulk_update_mappings(Video, pending)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"  ⚠ Bulk update failed ({e}); retrying rows individually")
+        for mapping in pending:
+            try:
+                VideoRepository.update_transcript(db, mapping['id'], mapping['transcript'])
+            except Exception as row_error:
+                logger.warning(f"  ✗ Error updating video {mapping['id']}: {row_error}")
+                db.rollback()
+    finally:
+        pending.clear()
+
+
+def _pending_transcript(video_id: int, transcript: str) -> dict:
+    """Build a bulk-update mapping for one video's transcript"""
+    return {
+        'id': video_id,
+        'transcript': transcript,
+        'transcript_fetched_at': datetime.now(timezone.utc)
+    }
+
+
+def fetch_transcripts_batch(limit: int = None, batch_size: int = 10, verbose: bool = False):
     """
     Fetch transcripts for videos that don't have them
     
     Args:
         limit: Maximum number of videos to process (None for all)
         batch_size: Number of videos to process before showing progress
+        verbose: Show per-video progress output (default: False)
     """
+    get_buffered_logger(__name__, capacity=batch_size, verbose=verbose)
+
     print("=" * 70)
     print("Fetching Transcripts for Videos")
     print("=" * 70)
@@ -32,10 +73,13 @@ def fetch_transcripts_batch(limit: int = None, batch_size: int = 10):
     db = next(db_gen)
     
     try:
-        # Get videos without transcripts
-        videos = VideoRepository.get_without_transcript(db, limit=limit)
-        total_count = len(videos)
-        
+        # Count first, then stream videos without transcripts (keeps memory
+        # bounded for large backlogs)
+        total_count = VideoRepository.count_without_transcript(db)
+        if limit:
+            total_count = min(total_count, limit)
+        videos = VideoRepository.iter_without_transcript(db, limit=limit)
+
         if total_count == 0:
             print("\n✓ All videos already have transcripts!")
             return
@@ -47,26 +91,30 @@ def fetch_transcripts_batch(limit: int = None, batch_size: int = 10):
         successful = 0
         failed = 0
         unavailable = 0
+        pending = []  # Buffered updates, flushed every BULK_FLUSH_SIZE rows
         
         for i, video in enumerate(videos, 1):
             try:
-                print(f"[{i}/{total_count}] Processing: {video.title[:60]}...")
-                print(f"  Video ID: {video.video_id}")
-                print(f"  URL: {video.url}")
+                logger.debug(f"[{i}/{total_count}] Processing: {video.title[:60]}...")
+                logger.debug(f"  Video ID: {video.video_id}")
+                logger.debug(f"  URL: {video.url}")
                 
                 # Fetch transcript
                 transcript_obj = youtube_service.get_transcript(video.video_id)
                 
                 if transcript_obj and transcript_obj.text:
-                    # Update video in database
-                    VideoRepository.update_transcript(db, video.id, transcript_obj.text)
+                    # Buffer the update; flushed in bulk below
+                    pending.append(_pending_transcript(video.id, transcript_obj.text))
                     successful += 1
-                    print(f"  ✓ Successfully fetched transcript ({len(transcript_obj.text)} chars)")
+                    logger.debug(f"  ✓ Successfully fetched transcript ({len(transcript_obj.text)} chars)")
                 else:
                     # Transcript not available - store placeholder to prevent retry loops
-                    VideoRepository.update_transcript(db, video.id, TRANSCRIPT_UNAVAILABLE)
+                    pending.append(_pending_transcript(video.id, TRANSCRIPT_UNAVAILABLE))
                     unavailable += 1
-                    print(f"  ✗ Transcript not available (stored placeholder)")
+                    logger.debug(f"  ✗ Transcript not available (stored placeholder)")
+                
+                if len(pending) >= BULK_FLUSH_SIZE:
+                    _flush_transcript_updates(db, pending)
                 
                 # Show progress every batch_size videos
                 if i % batch_size == 0:
@@ -74,17 +122,20 @@ def fetch_transcripts_batch(limit: int = None, batch_size: int = 10):
                     
             except (TranscriptsDisabled, NoTranscriptFound) as e:
                 # Transcript is explicitly disabled or not found - store placeholder
-                VideoRepository.update_transcript(db, video.id, TRANSCRIPT_UNAVAILABLE)
+                pending.append(_pending_transcript(video.id, TRANSCRIPT_UNAVAILABLE))
                 unavailable += 1
-                print(f"  ✗ Transcript not available: {type(e).__name__}")
-                db.commit()  # Commit the placeholder
+                logger.debug(f"  ✗ Transcript not available: {type(e).__name__}")
                 continue
             except Exception as e:
                 failed += 1
-                print(f"  ✗ Error: {e}")
+                logger.warning(f"  ✗ Error: {e}")
                 db.rollback()  # Rollback on error
                 continue
         
+        # Flush any remaining buffered updates
+        _flush_transcript_updates(db, pending)
+        flush_logger(logger)
+        
         print("\n" + "=" * 70)
         print("Summary")
         print("=" * 70)
@@ -96,7 +147,6 @@ def fetch_transcripts_batch(limit: int = None, batch_size: int = 10):
         
     except Exception as e:
         print(f"\n✗ Error: {e}")
-        import traceback
         traceback.print_exc()
     finally:
         db.close()
@@ -104,14 +154,9 @@ def fetch_transcripts_batch(limit: int = None, batch_size: int = 10):
 
 def main():
     """Main entry point"""
-    limit = None
-    if len(sys.argv) > 1:
-        try:
-            limit = int(sys.argv[1])
-        except ValueError:
-            print(f"Invalid limit value: {sys.argv[1]}. Processing all videos.")
-    
-    fetch_transcripts_batch(limit=limit)
+    args = parse_batch_args("Fetch transcripts for videos missing them")
+    fetch_transcripts_batch(limit=args.limit, batch_size=args.batch_size,
+                            verbose=args.verbose)
 
 
 if __name__ == "__main__":
@@ -1,16 +1,13 @@
 """Script to generate email content from ranked digests"""
 
-import sys
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import _bootstrap  # noqa: F401  (puts the project root on sys.path)
+from _cli import parse_email_args
 
 from app.database.connection import get_db_session
 from app.database.repository import DigestRepository
-from app.agents.news_anchor_agent import NewsAnchorAgent
-from app.agents.email_agent import EmailAgent
 from app.profiles.user_profile import UserProfile
 
 
@@ -26,7 +23,12 @@ def generate_email_for_user(email: str, hours: int = 24, output_format: str = "t
     print("=" * 70)
     print(f"Generating Email Digest for User: {email}")
     print("=" * 70)
-    
+
+    # Imported here so usage errors don't pay the OpenAI SDK import cost
+    from app.agents.news_anchor_agent import NewsAnchorAgent
+    from app.agents.email_agent import EmailAgent
+    from app.agents.prefilter import top_k_by_relevance, DEFAULT_TOP_K
+
     # Get user profile
     profile = UserProfile.get_profile(email)
     if not profile:
@@ -48,14 +50,25 @@ def generate_email_for_user(email: str, hours: int = 24, output_format: str = "t
     db = next(db_gen)
     
     try:
-        digests = DigestRepository.get_recent(db, hours=hours)
-        
-        if not digests:
+        # Stream the digest rows and build digest_data in one pass, so
+        # only the plain dicts (not a parallel ORM list) are held in memory
+        digest_data = [
+            {
+                "id": d.id,
+                "url": d.url,
+                "title": d.title,
+                "summary": d.summary,
+                "content_type": d.content_type
+            }
+            for d in DigestRepository.iter_recent(db, hours=hours)
+        ]
+
+        if not digest_data:
             print(f"\n✓ No digests found in the last {hours} hours")
             return
-        
-        print(f"\nFound {len(digests)} digests from the last {hours} hours")
-        
+
+        print(f"\nFound {len(digest_data)} digests from the last {hours} hours")
+
         # Initialize agents
         try:
             ranking_agent = NewsAnchorAgent()
@@ -65,20 +78,15 @@ def generate_email_for_user(email: str, hours: int = 24, output_format: str = "t
             print(f"✗ Error initializing agents: {e}")
             return
         
-        # Prepare digest data for ranking
-        digest_data = [
-            {
-                "id": d.id,
-                "url": d.url,
-                "title": d.title,
-                "summary": d.summary,
-                "content_type": d.content_type
-            }
-            for d in digests
-        ]
-        
+        # Cheap lexical pre-filter so the LLM only fine-ranks the top K
+        if len(digest_data) > DEFAULT_TOP_K:
+            digest_data = top_k_by_relevance(
+                digest_data, f"{profile['background'] or ''} {profile['interests'] or ''}"
+            )
+            print(f"\nPre-filtered to top {len(digest_data)} digests by profile similarity")
+
         print(f"\nRanking {len(digest_data)} digests...")
-        
+
         # Rank digests
         ranking = ranking_agent.rank_digests(
             digests=digest_data,
@@ -87,31 +95,38 @@ def generate_email_for_user(email: str, hours: int = 24, output_format: str = "t
             interests=profile['interests'] or ""
         )
         
-        # Prepare ranked items for email (include all needed fields)
+        # Prepare ranked items for email (index digests by URL once for
+        # O(1) lookups instead of a linear scan per ranked item)
+        by_url = {d['url']: d for d in digest_data}
         ranked_items = [
             {
                 "rank": item.rank,
                 "title": item.title,
-                "summary": next((d['summary'] for d in digest_data if d['url'] == item.url), ""),
+                "summary": by_url.get(item.url, {}).get('summary', ""),
                 "url": item.url,
                 "relevance_score": item.relevance_score,
-                "content_type": next((d['content_type'] for d in digest_data if d['url'] == item.url), "unknown")
+                "content_type": by_url.get(item.url, {}).get('content_type', "unknown")
             }
             for item in ranking.ranked_items[:10]  # Top 10
         ]
         
         print(f"✓ Ranked {len(ranked_items)} top digests")
         
+        # Timestamp and filename parts are computed once and reused, so the
+        # html/text outputs can't straddle a date rollover
+        now = datetime.now()
+        output_base = f"email_digest_{email.replace('@', '_at_')}_{now.strftime('%Y%m%d')}"
+
         # Generate email content
         print("\nGenerating email content...")
         email_content = email_agent.generate_email_content(
             user_name=user_name,
             ranked_items=ranked_items,
-            date=datetime.now()
+            date=now
         )
-        
+
         print("✓ Email content generated")
-        
+
         # Output based on format
         if output_format == "html" or output_format == "both":
             html_content = email_agent.format_email_html(email_content)
@@ -119,22 +134,22 @@ def generate_email_for_user(email: str, hours: int = 24, output_format: str = "t
             print("HTML Email Content")
             print("=" * 70)
             print(html_content)
-            
+
             # Save to file
-            html_file = f"email_digest_{email.replace('@', '_at_')}_{datetime.now().strftime('%Y%m%d')}.html"
+            html_file = f"{output_base}.html"
             with open(html_file, 'w', encoding='utf-8') as f:
                 f.write(html_content)
             print(f"\n✓ HTML email saved to: {html_file}")
-        
+
         if output_format == "text" or output_format == "both":
             text_content = email_agent.format_email_text(email_content)
             print("\n" + "=" * 70)
             print("Plain Text Email Content")
             print("=" * 70)
             print(text_content)
-            
+
             # Save to file
-            text_file = f"email_digest_{email.replace('@', '_at_')}_{datetime.now().strftime('%Y%m%d')}.txt"
+            text_file = f"{output_base}.txt"
             with open(text_file, 'w', encoding='utf-8') as f:
                 f.write(text_content)
             print(f"\n✓ Text email saved to: {text_file}")
@@ -153,31 +168,172 @@ def generate_email_for_user(email: str, hours: int = 24, output_format: str = "t
         db.close()
 
 
+def _save_email_files(email_agent, email: str, email_content, output_format: str):
+    """Print and save one user's generated email in the requested format(s)"""
+    output_base = f"email_digest_{email.replace('@', '_at_')}_{datetime.now().strftime('%Y%m%d')}"
+
+    if output_format == "html" or output_format == "both":
+        html_content = email_agent.format_email_html(email_content)
+        html_file = f"{output_base}.html"
+        with open(html_file, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        print(f"✓ HTML email for {email} saved to: {html_file}")
+
+    if output_format == "text" or output_format == "both":
+        text_content = email_agent.format_email_text(email_content)
+        text_file = f"{output_base}.txt"
+        with open(text_file, 'w', encoding='utf-8') as f:
+            f.write(text_content)
+        print(f"✓ Text email for {email} saved to: {text_file}")
+
+
+def generate_emails_for_users(emails, hours: int = 24, output_format: str = "text",
+                              concurrency: int = 8):
+    """
+    Generate email content for multiple users in one pass
+
+    Agents are initialized once and the digest window is fetched once;
+    the per-user ranking + email-generation LLM calls (the slow,
+    network-bound part) run concurrently in a thread pool. File output
+    happens on the main thread as results complete.
+
+    Args:
+        emails: List of user email addresses
+        hours: Number of hours to look back for digests (default: 24)
+        output_format: Output format - 'text', 'html', or 'both' (default: 'text')
+        concurrency: Number of concurrent ranking/generation workers
+
+    Returns:
+        Dictionary mapping email -> email content (failed users omitted)
+    """
+    print("=" * 70)
+    print(f"Generating Email Digests for {len(emails)} Users")
+    print("=" * 70)
+
+    # Imported here so usage errors don't pay the OpenAI SDK import cost
+    from app.agents.news_anchor_agent import NewsAnchorAgent
+    from app.agents.email_agent import EmailAgent
+    from app.agents.prefilter import top_k_by_relevance, DEFAULT_TOP_K
+
+    # Initialize agents once for the whole batch
+    try:
+        ranking_agent = NewsAnchorAgent()
+        email_agent = EmailAgent()
+        print("✓ Agents initialized")
+    except Exception as e:
+        print(f"✗ Error initializing agents: {e}")
+        return {}
+
+    # Fetch the digest window once; it's the same for every user. Rows are
+    # streamed straight into plain dicts to keep peak memory at one copy.
+    db_gen = get_db_session()
+    db = next(db_gen)
+    try:
+        digest_data = [
+            {
+                "id": d.id,
+                "url": d.url,
+                "title": d.title,
+                "summary": d.summary,
+                "content_type": d.content_type
+            }
+            for d in DigestRepository.iter_recent(db, hours=hours)
+        ]
+    finally:
+        db.close()
+
+    if not digest_data:
+        print(f"\n✓ No digests found in the last {hours} hours")
+        return {}
+
+    print(f"\nFound {len(digest_data)} digests from the last {hours} hours")
+
+    # One query fetches every recipient's profile; workers then do pure
+    # dict lookups instead of a database round-trip per user
+    profiles = UserProfile.get_profiles(emails)
+
+    def generate_for_user(email: str):
+        """Rank + generate one user's email (LLM calls only, no DB writes)"""
+        profile = profiles.get(email)
+        if not profile or not profile.get("name"):
+            raise ValueError("profile missing or has no name")
+
+        # Cheap lexical pre-filter so the LLM only fine-ranks the top K
+        user_digests = digest_data
+        if len(user_digests) > DEFAULT_TOP_K:
+            user_digests = top_k_by_relevance(
+                user_digests, f"{profile['background'] or ''} {profile['interests'] or ''}"
+            )
+
+        ranking = ranking_agent.rank_digests(
+            digests=user_digests,
+            name=profile['name'],
+            background=profile['background'] or "",
+            interests=profile['interests'] or ""
+        )
+
+        by_url = {d['url']: d for d in user_digests}
+        ranked_items = [
+            {
+                "rank": item.rank,
+                "title": item.title,
+                "summary": by_url.get(item.url, {}).get('summary', ""),
+                "url": item.url,
+                "relevance_score": item.relevance_score,
+                "content_type": by_url.get(item.url, {}).get('content_type', "unknown")
+            }
+            for item in ranking.ranked_items[:10]  # Top 10
+        ]
+
+        return email_agent.generate_email_content(
+            user_name=profile['name'],
+            ranked_items=ranked_items,
+            date=datetime.now()
+        )
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {executor.submit(generate_for_user, email): email for email in emails}
+        write_futures = []
+        for future in as_completed(futures):
+            email = futures[future]
+            try:
+                email_content = future.result()
+            except Exception as e:
+                print(f"✗ Error generating email for {email}: {e}")
+                continue
+            results[email] = email_content
+            # Hand the disk writes back to the pool so they overlap with
+            # other users' still-running LLM calls
+            write_futures.append(
+                executor.submit(_save_email_files, email_agent, email, email_content, output_format)
+            )
+        for write_future in write_futures:
+            try:
+                write_future.result()
+            except Exception as e:
+                print(f"✗ Error writing email files: {e}")
+
+    print("\n" + "=" * 70)
+    print(f"Email Generation Complete! ({len(results)}/{len(emails)} users)")
+    print("=" * 70)
+
+    return results
+
+
 def main():
     """Main entry point"""
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/generate_email.py <email> [hours] [format]")
-        print("Example: python scripts/generate_email.py user@example.com 24 html")
-        print("\nFormats: text (default), html, both")
-        sys.exit(1)
-    
-    email = sys.argv[1]
-    hours = 24
-    output_format = "text"
-    
-    if len(sys.argv) > 2:
-        try:
-            hours = int(sys.argv[2])
-        except ValueError:
-            print(f"Invalid hours value: {sys.argv[2]}. Using default: 24 hours")
-    
-    if len(sys.argv) > 3:
-        output_format = sys.argv[3].lower()
-        if output_format not in ["text", "html", "both"]:
-            print(f"Invalid format: {output_format}. Using default: text")
-            output_format = "text"
-    
-    generate_email_for_user(email, hours, output_format)
+    args = parse_email_args(
+        "Generate email content from ranked digests "
+        "(email accepts a comma-separated list)",
+        with_format=True
+    )
+
+    emails = [e.strip() for e in args.email.split(",") if e.strip()]
+    if len(emails) > 1:
+        generate_emails_for_users(emails, args.hours, args.format)
+    else:
+        generate_email_for_user(emails[0], args.hours, args.format)
 
 
 if __name__ == "__main__":
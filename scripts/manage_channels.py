@@ -1,10 +1,8 @@
 """Helper script to manage YouTube channels"""
 
 import sys
-from pathlib import Path
 
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import _bootstrap  # noqa: F401  (puts the project root on sys.path)
 
 from app.config import YOUTUBE_CHANNELS
 
@@ -1,10 +1,8 @@
 """Script to manage user profiles"""
 
 import sys
-from pathlib import Path
 
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import _bootstrap  # noqa: F401  (puts the project root on sys.path)
 
 from app.profiles.user_profile import UserProfile
 
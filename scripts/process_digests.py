@@ -1,30 +1,43 @@
 """Script to process articles and videos and generate digests"""
 
-import sys
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import _bootstrap  # noqa: F401  (puts the project root on sys.path)
+from _cli import parse_batch_args
 
 from app.database.connection import get_db_session
-from app.database.repository import (
-    ArticleRepository, VideoRepository, DigestRepository
-)
-from app.agents.digest_agent import DigestAgent
+from app.database.repository import DigestRepository
+from app.utils.batch_logging import get_buffered_logger, flush_logger
 
+logger = get_buffered_logger(__name__)
 
-def process_digests(limit: int = None, batch_size: int = 10):
+
+def process_digests(limit: int = None, batch_size: int = 10, max_workers: int = 16,
+                    verbose: bool = False, sample: int = None):
     """
     Process articles and videos to generate digests
-    
+
+    Digest generation is network-bound (one OpenAI round-trip per item),
+    so LLM calls run concurrently in a thread pool; database writes stay
+    on the main thread as results complete.
+
     Args:
         limit: Maximum number of items to process (None for all)
         batch_size: Number of items to process before showing progress
+        max_workers: Number of concurrent digest-generation workers
+        verbose: Show per-item progress output (default: False)
+        sample: Process only a random sample of this many pending items
+            per table (None for all; useful when iterating on prompts)
     """
+    get_buffered_logger(__name__, capacity=batch_size, verbose=verbose)
+
     print("=" * 70)
     print("Processing Digests")
     print("=" * 70)
-    
+
+    # Imported here so usage errors don't pay the OpenAI SDK import cost
+    from app.agents.digest_agent import DigestAgent
+
     # Initialize digest agent
     try:
         agent = DigestAgent()
@@ -39,13 +52,13 @@ def process_digests(limit: int = None, batch_size: int = 10):
     db = next(db_gen)
     
     try:
-        # Get articles without digests
-        articles = ArticleRepository.get_all(db, limit=limit)
-        videos = VideoRepository.get_all(db, limit=limit)
-        
-        # Filter out items that already have digests
-        articles_to_process = [a for a in articles if not DigestRepository.exists_by_url(db, a.url)]
-        videos_to_process = [v for v in videos if not DigestRepository.exists_by_url(db, v.url)]
+        # Anti-join against digests so the database returns only the
+        # articles and videos that still need processing
+        articles_to_process, videos_to_process = DigestRepository.get_pending_items(
+            db, limit=limit, sample=sample
+        )
+        if sample:
+            print(f"(random sample of up to {sample} pending items per table)")
         
         total_count = len(articles_to_process) + len(videos_to_process)
         
@@ -58,61 +71,111 @@ def process_digests(limit: int = None, batch_size: int = 10):
         
         successful = 0
         failed = 0
-        
-        # Helper function to process a single item
-        def process_item(item, item_type: str, item_id: int):
-            """Process a single article or video"""
-            nonlocal successful, failed
-            processed = successful + failed + 1
-            
+
+        # Worker function: LLM call only, no database access (sessions are
+        # not thread-safe). Takes a plain-dict snapshot of the item and
+        # returns the digest row for the main thread to save.
+        def generate_item_digest(item: dict):
+            """Generate a digest for a single article or video snapshot"""
+            if item["item_type"] == "article":
+                digest_output = agent.generate_digest_from_article(
+                    title=item["title"],
+                    description=item["description"] or "",
+                    markdown_content=item["content"]
+                )
+                return {
+                    "url": item["url"], "title": digest_output.title,
+                    "summary": digest_output.summary, "content_type": "article",
+                    "article_id": item["id"], "created_at": item["published_at"]
+                }
+            else:  # video
+                digest_output = agent.generate_digest_from_video(
+                    title=item["title"],
+                    description=item["description"] or "",
+                    transcript=item["content"]
+                )
+                return {
+                    "url": item["url"], "title": digest_output.title,
+                    "summary": digest_output.summary, "content_type": "video",
+                    "video_id": item["id"], "created_at": item["published_at"]
+                }
+
+        pending = []  # Buffered digest rows, flushed in bulk every batch_size
+
+        def flush_pending():
+            """Insert buffered digests in one bulk statement + commit"""
+            if not pending:
+                return
             try:
-                print(f"[{processed}/{total_count}] Processing {item_type}: {item.title[:60]}...")
-                print(f"  URL: {item.url}")
-                
-                # Generate digest based on type
-                if item_type == "article":
-                    digest_output = agent.generate_digest_from_article(
-                        title=item.title,
-                        description=item.description or "",
-                        markdown_content=item.markdown_content
-                    )
-                    DigestRepository.create(
-                        db, url=item.url, title=digest_output.title,
-                        summary=digest_output.summary, content_type="article",
-                        article_id=item_id, published_at=item.published_at
-                    )
-                else:  # video
-                    digest_output = agent.generate_digest_from_video(
-                        title=item.title,
-                        description=item.description or "",
-                        transcript=item.transcript
-                    )
-                    DigestRepository.create(
-                        db, url=item.url, title=digest_output.title,
-                        summary=digest_output.summary, content_type="video",
-                        video_id=item_id, published_at=item.published_at
-                    )
-                
-                successful += 1
-                print(f"  ✓ Generated digest: {digest_output.title[:60]}...")
-                
+                DigestRepository.bulk_create(db, list(pending))
+            except Exception as e:
+                db.rollback()
+                print(f"  ⚠ Bulk digest insert failed ({e}); retrying rows individually")
+                for row in pending:
+                    try:
+                        DigestRepository.create(
+                            db, url=row['url'], title=row['title'],
+                            summary=row['summary'], content_type=row['content_type'],
+                            article_id=row.get('article_id'), video_id=row.get('video_id'),
+                            published_at=row.get('created_at')
+                        )
+                    except Exception as row_error:
+                        print(f"  ✗ Error inserting digest for {row['url']}: {row_error}")
+                        db.rollback()
+            finally:
+                pending.clear()
+
+        # Snapshot the fields each worker needs into plain dicts before
+        # anything is submitted: flush_pending commits on the main thread
+        # expire the ORM instances, and a lazy refresh from a worker
+        # would go through the shared, non-thread-safe session
+        work = [
+            {"item_type": "article", "id": a.id, "url": a.url, "title": a.title,
+             "description": a.description, "published_at": a.published_at,
+             "content": a.markdown_content}
+            for a in articles_to_process
+        ]
+        work += [
+            {"item_type": "video", "id": v.id, "url": v.url, "title": v.title,
+             "description": v.description, "published_at": v.published_at,
+             "content": v.transcript}
+            for v in videos_to_process
+        ]
+
+        # Fan the LLM calls out to the pool; save results on the main thread
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                executor.submit(generate_item_digest, item): item
+                for item in work
+            }
+            for future in as_completed(futures):
+                item = futures[future]
+                processed = successful + failed + 1
+                logger.debug(f"[{processed}/{total_count}] Processed {item['item_type']}: {item['title'][:60]}...")
+
+                try:
+                    row = future.result()
+                    pending.append(row)
+                    successful += 1
+                    logger.debug(f"  ✓ Generated digest: {row['title'][:60]}...")
+                except Exception as e:
+                    # LLM-stage failure: nothing has touched the session, so
+                    # there's no transaction to roll back — doing so would
+                    # only discard other items' pending state
+                    failed += 1
+                    logger.warning(f"  ✗ Error: {e}")
+
+                if len(pending) >= batch_size:
+                    flush_pending()
+
                 # Show progress every batch_size items
                 if processed % batch_size == 0:
                     print(f"\n  Progress: {successful} successful, {failed} failed\n")
-                    
-            except Exception as e:
-                failed += 1
-                print(f"  ✗ Error: {e}")
-                db.rollback()
-        
-        # Process articles
-        for article in articles_to_process:
-            process_item(article, "article", article.id)
-        
-        # Process videos
-        for video in videos_to_process:
-            process_item(video, "video", video.id)
-        
+
+        # Flush any remaining buffered digests and log output
+        flush_pending()
+        flush_logger(logger)
+
         print("\n" + "=" * 70)
         print("Summary")
         print("=" * 70)
@@ -131,14 +194,10 @@ def process_digests(limit: int = None, batch_size: int = 10):
 
 def main():
     """Main entry point"""
-    limit = None
-    if len(sys.argv) > 1:
-        try:
-            limit = int(sys.argv[1])
-        except ValueError:
-            print(f"Invalid limit value: {sys.argv[1]}. Processing all items.")
-    
-    process_digests(limit=limit)
+    args = parse_batch_args("Generate digests for articles and videos",
+                            default_jobs=16, with_sample=True)
+    process_digests(limit=args.limit, batch_size=args.batch_size,
+                    max_workers=args.jobs, verbose=args.verbose, sample=args.sample)
 
 
 if __name__ == "__main__":
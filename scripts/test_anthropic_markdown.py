@@ -1,6 +1,7 @@
 """Test markdown conversion for Anthropic articles"""
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent
@@ -39,22 +40,32 @@ def test_markdown_conversion():
         markdown = scraper.get_content_as_markdown(test_url)
         
         if markdown:
+            # Split once and derive every stat from the same list in a
+            # single pass, instead of re-scanning the markdown per stat
+            lines = markdown.splitlines()
+            non_empty = 0
+            headers = 0
+            for line in lines:
+                stripped = line.strip()
+                if stripped:
+                    non_empty += 1
+                    if stripped.startswith('#'):
+                        headers += 1
+
             print(f"✓ Successfully converted to markdown")
             print(f"  Length: {len(markdown)} characters")
-            print(f"  Lines: {len(markdown.split(chr(10)))}")
-            
+            print(f"  Lines: {len(lines)}")
+
             print(f"\nFirst 500 characters:")
             print("-" * 70)
             print(markdown[:500])
             print("-" * 70)
-            
+
             # Show some stats
-            lines = markdown.split('\n')
-            non_empty = [l for l in lines if l.strip()]
             print(f"\nMarkdown stats:")
             print(f"  Total lines: {len(lines)}")
-            print(f"  Non-empty lines: {len(non_empty)}")
-            print(f"  Headers (#): {len([l for l in lines if l.strip().startswith('#')])}")
+            print(f"  Non-empty lines: {non_empty}")
+            print(f"  Headers (#): {headers}")
         else:
             print("✗ Failed to convert to markdown")
     except Exception as e:
@@ -92,19 +103,27 @@ def test_multiple_articles():
         return
     
     print(f"\nTesting markdown conversion for first 3 articles:")
-    
-    for i, article in enumerate(articles[:3], 1):
-        print(f"\n{i}. [{article.feed_type}] {article.title}")
-        print(f"   URL: {article.url}")
-        
+
+    # Fetch + convert concurrently: each call is network-bound, so
+    # overlapping the requests hides most of the HTTP latency
+    def fetch(article):
         try:
-            markdown = scraper.get_content_as_markdown(article.url)
-            if markdown:
+            return article, scraper.get_content_as_markdown(article.url), None
+        except Exception as e:
+            return article, None, e
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = executor.map(fetch, articles[:3])
+        for i, (article, markdown, error) in enumerate(results, 1):
+            print(f"\n{i}. [{article.feed_type}] {article.title}")
+            print(f"   URL: {article.url}")
+
+            if error:
+                print(f"   ✗ Error: {error}")
+            elif markdown:
                 print(f"   ✓ Converted: {len(markdown)} characters")
             else:
                 print(f"   ✗ Failed to convert")
-        except Exception as e:
-            print(f"   ✗ Error: {e}")
 
 
 if __name__ == "__main__":
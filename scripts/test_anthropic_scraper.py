@@ -1,6 +1,8 @@
 """Test script for Anthropic news scraper"""
 
 import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent
@@ -25,24 +27,24 @@ def test_all_feeds():
     print(f"\nTotal articles found: {len(articles)}")
     
     # Group by feed type
-    by_feed = {}
+    by_feed = defaultdict(list)
     for article in articles:
-        feed_type = article.feed_type
-        if feed_type not in by_feed:
-            by_feed[feed_type] = []
-        by_feed[feed_type].append(article)
+        by_feed[article.feed_type].append(article)
     
-    print(f"\nArticles by feed type:")
+    # Accumulate the per-item output and write it in one go, instead of
+    # one write syscall per print when stdout is piped or unbuffered
+    lines = ["\nArticles by feed type:"]
     for feed_type, feed_articles in sorted(by_feed.items()):
-        print(f"  {feed_type}: {len(feed_articles)} articles")
-    
-    print(f"\n--- Sample Articles (first 10) ---")
+        lines.append(f"  {feed_type}: {len(feed_articles)} articles")
+
+    lines.append("\n--- Sample Articles (first 10) ---")
     for i, article in enumerate(articles[:10], 1):
-        print(f"\n{i}. {article.title}")
-        print(f"   Feed: {article.feed_type}")
-        print(f"   URL: {article.url}")
-        print(f"   Published: {article.published_at}")
-        print(f"   Description: {article.description[:100]}...")
+        lines.append(f"\n{i}. {article.title}")
+        lines.append(f"   Feed: {article.feed_type}")
+        lines.append(f"   URL: {article.url}")
+        lines.append(f"   Published: {article.published_at}")
+        lines.append(f"   Description: {article.description[:100]}...")
+    print("\n".join(lines))
 
 
 def test_individual_feeds():
@@ -52,21 +54,30 @@ def test_individual_feeds():
     print("=" * 70)
     
     scraper = AnthropicNewsScraper()
-    
-    for feed_type in ["news", "engineering", "research", "red"]:
-        print(f"\n--- {feed_type.upper()} Feed ---")
-        try:
-            articles = scraper.get_articles_by_feed(feed_type, hours=24 * 30)
-            print(f"Found {len(articles)} articles")
-            
-            if articles:
-                print(f"\nSample articles:")
-                for i, article in enumerate(articles[:3], 1):
-                    print(f"  {i}. {article.title}")
-                    print(f"     Published: {article.published_at}")
-                    print(f"     URL: {article.url[:60]}...")
-        except Exception as e:
-            print(f"Error: {e}")
+    feed_types = ["news", "engineering", "research", "red"]
+
+    # The four feeds are independent network fetches, so fire them
+    # concurrently and print results in the original deterministic order
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {
+            feed_type: executor.submit(scraper.get_articles_by_feed, feed_type, 24 * 30)
+            for feed_type in feed_types
+        }
+        for feed_type in feed_types:
+            lines = [f"\n--- {feed_type.upper()} Feed ---"]
+            try:
+                articles = futures[feed_type].result()
+                lines.append(f"Found {len(articles)} articles")
+
+                if articles:
+                    lines.append("\nSample articles:")
+                    for i, article in enumerate(articles[:3], 1):
+                        lines.append(f"  {i}. {article.title}")
+                        lines.append(f"     Published: {article.published_at}")
+                        lines.append(f"     URL: {article.url[:60]}...")
+            except Exception as e:
+                lines.append(f"Error: {e}")
+            print("\n".join(lines))
 
 
 def test_convenience_functions():
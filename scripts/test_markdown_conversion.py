@@ -35,11 +35,12 @@ def test_markdown_conversion():
             print(markdown[:500])
             print("-" * 70)
             
-            # Show some stats
-            lines = markdown.split('\n')
+            # Show some stats (counted in one pass, no intermediate lists)
+            total_lines = markdown.count('\n') + 1
+            non_empty = sum(1 for l in markdown.splitlines() if l.strip())
             print(f"\nMarkdown stats:")
-            print(f"  Total lines: {len(lines)}")
-            print(f"  Non-empty lines: {len([l for l in lines if l.strip()])}")
+            print(f"  Total lines: {total_lines}")
+            print(f"  Non-empty lines: {non_empty}")
         else:
             print("✗ Failed to convert to markdown")
     except Exception as e:
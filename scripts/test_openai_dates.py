@@ -1,8 +1,10 @@
 """Test date handling in OpenAI news scraper"""
 
+import bisect
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
@@ -23,38 +25,38 @@ def test_date_parsing():
     test_cases = [
         {
             'name': 'Entry with published_parsed',
-            'entry': type('obj', (object,), {
+            'entry': SimpleNamespace(**{
                 'published_parsed': (2024, 1, 15, 10, 30, 0, 0, 0, 0),
                 'title': 'Test Article 1',
                 'link': 'https://example.com/article1',
                 'summary': 'Test description'
-            })()
+            })
         },
         {
             'name': 'Entry with published string',
-            'entry': type('obj', (object,), {
+            'entry': SimpleNamespace(**{
                 'published': 'Mon, 15 Jan 2024 10:30:00 GMT',
                 'title': 'Test Article 2',
                 'link': 'https://example.com/article2',
                 'summary': 'Test description'
-            })()
+            })
         },
         {
             'name': 'Entry with ISO format',
-            'entry': type('obj', (object,), {
+            'entry': SimpleNamespace(**{
                 'published': '2024-01-15T10:30:00Z',
                 'title': 'Test Article 3',
                 'link': 'https://example.com/article3',
                 'summary': 'Test description'
-            })()
+            })
         },
         {
             'name': 'Entry without date',
-            'entry': type('obj', (object,), {
+            'entry': SimpleNamespace(**{
                 'title': 'Test Article 4',
                 'link': 'https://example.com/article4',
                 'summary': 'Test description'
-            })()
+            })
         }
     ]
     
@@ -91,23 +93,29 @@ def test_time_filtering():
     print(f"\nTest articles:")
     for article_data in articles_data:
         print(f"  - {article_data['title']}: {article_data['published_at']}")
-    
+
+    # Sort once oldest-first; each time window is then a single bisect
+    # cut (O(log N)) instead of a full filtering pass per cutoff
+    articles_sorted = sorted(articles_data, key=lambda a: a['published_at'])
+    dates = [a['published_at'] for a in articles_sorted]
+
     # Test 24-hour filter
     print(f"\n--- Testing 24-hour filter ---")
     cutoff_24h = now - timedelta(hours=24)
     print(f"Cutoff: {cutoff_24h}")
-    
-    filtered_24h = [a for a in articles_data if a['published_at'] >= cutoff_24h]
+
+    # Slice reversed so output stays newest-first like the input list
+    filtered_24h = articles_sorted[bisect.bisect_left(dates, cutoff_24h):][::-1]
     print(f"Articles within 24 hours: {len(filtered_24h)}")
     for article in filtered_24h:
         print(f"  ✓ {article['title']}")
-    
+
     # Test 48-hour filter
     print(f"\n--- Testing 48-hour filter ---")
     cutoff_48h = now - timedelta(hours=48)
     print(f"Cutoff: {cutoff_48h}")
-    
-    filtered_48h = [a for a in articles_data if a['published_at'] >= cutoff_48h]
+
+    filtered_48h = articles_sorted[bisect.bisect_left(dates, cutoff_48h):][::-1]
     print(f"Articles within 48 hours: {len(filtered_48h)}")
     for article in filtered_48h:
         print(f"  ✓ {article['title']}")
@@ -167,24 +175,24 @@ def test_timezone_awareness():
     
     # Test with different date formats
     test_entries = [
-        type('obj', (object,), {
+        SimpleNamespace(**{
             'published_parsed': (2024, 1, 15, 10, 30, 0, 0, 0, 0),
             'title': 'Test',
             'link': 'https://example.com/test',
             'summary': 'Test'
-        })(),
-        type('obj', (object,), {
+        }),
+        SimpleNamespace(**{
             'published': 'Mon, 15 Jan 2024 10:30:00 +0000',
             'title': 'Test',
             'link': 'https://example.com/test',
             'summary': 'Test'
-        })(),
-        type('obj', (object,), {
+        }),
+        SimpleNamespace(**{
             'published': '2024-01-15T10:30:00Z',
             'title': 'Test',
             'link': 'https://example.com/test',
             'summary': 'Test'
-        })(),
+        }),
     ]
     
     print("\nTesting date parsing for timezone awareness:")